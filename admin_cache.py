@@ -0,0 +1,95 @@
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Статусы участника, дающие права администратора
+ADMIN_STATUSES = ('administrator', 'creator')
+
+
+class ChatAdminCache:
+    """
+    Кэш администраторов чатов.
+
+    Список администраторов запрашивается через get_chat_administrators один раз
+    на чат и живет ttl секунд. Изменения прав, пришедшие через ChatMemberHandler,
+    применяются к кэшу сразу, поэтому проверка прав - O(1) без запросов к API.
+    Хранится не больше max_size чатов (LRU), устаревшие записи удаляются при обращении.
+    """
+
+    def __init__(self, ttl: float = 600, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._admins: 'OrderedDict[int, Tuple[float, Set[int]]]' = OrderedDict()  # chat_id -> (expires_at, {user_id})
+        self._pending: Dict[int, asyncio.Task] = {}  # chat_id -> запрос списка, который уже выполняется
+        self.hits = 0
+        self.misses = 0
+
+    async def is_admin(self, bot, chat_id: int, user_id: int) -> bool:
+        """Проверяет, является ли пользователь администратором чата"""
+        entry = self._admins.get(chat_id)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self.hits += 1
+                self._admins.move_to_end(chat_id)
+                return user_id in entry[1]
+            # Устаревшую запись удаляем, но оставляем как запасной вариант на этот вызов
+            del self._admins[chat_id]
+
+        self.misses += 1
+        admins = await self._fetch(bot, chat_id)
+        if admins is None:
+            # Не удалось обновить список - используем устаревший, если он есть
+            return entry is not None and user_id in entry[1]
+        return user_id in admins
+
+    async def _fetch(self, bot, chat_id: int) -> Optional[Set[int]]:
+        """Запрашивает список администраторов; одновременные запросы одного чата объединяются"""
+        task = self._pending.get(chat_id)
+        if task is None:
+            task = asyncio.ensure_future(self._load(bot, chat_id))
+            self._pending[chat_id] = task
+            task.add_done_callback(lambda _: self._pending.pop(chat_id, None))
+        return await asyncio.shield(task)
+
+    async def _load(self, bot, chat_id: int) -> Optional[Set[int]]:
+        try:
+            members = await bot.get_chat_administrators(chat_id)
+        except Exception as e:
+            logger.warning(
+                "Не удалось получить администраторов чата %s: %s", chat_id, e,
+                extra={'chat_id': chat_id}
+            )
+            return None
+
+        admins = {member.user.id for member in members}
+        self._admins[chat_id] = (time.monotonic() + self.ttl, admins)
+        self._admins.move_to_end(chat_id)
+        while len(self._admins) > self.max_size:
+            self._admins.popitem(last=False)
+        return admins
+
+    def update_member(self, chat_id: int, user_id: int, status: str):
+        """Применяет изменение статуса участника (из обновления chat_member)"""
+        entry = self._admins.get(chat_id)
+        if entry is None:
+            return
+        if status in ADMIN_STATUSES:
+            entry[1].add(user_id)
+        else:
+            entry[1].discard(user_id)
+
+    def invalidate(self, chat_id: int):
+        """Сбрасывает кэш чата - список будет запрошен при следующей проверке"""
+        self._admins.pop(chat_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает счетчики попаданий и промахов"""
+        return {
+            'chats': len(self._admins),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -0,0 +1,65 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Set, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class MicroBatcher(Generic[T]):
+    """
+    Собирает элементы с одинаковым ключом в течение короткого окна
+    и передает их обработчику одной пачкой.
+
+    Первый элемент ключа открывает окно и планирует сброс отдельной задачей,
+    поэтому add() не блокирует обработку следующих обновлений.
+    """
+
+    def __init__(self, window: float, flush: Callable[[Hashable, List[T]], Awaitable[None]]):
+        self.window = window  # Длительность окна в секундах
+        self.flush = flush
+        self._pending: Dict[Hashable, List[T]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0  # Количество сброшенных пачек
+        self.items = 0  # Количество элементов во всех пачках
+
+    def add(self, key: Hashable, item: T, create_task: Optional[Callable] = None):
+        """
+        Добавляет элемент в пачку ключа, открывая окно при необходимости.
+
+        create_task - функция запуска сброса (например, Application.create_task):
+        она получает корутину и первый элемент пачки как update, поэтому ошибки
+        попадают в обработчик ошибок приложения, а пачки дожидаются при остановке.
+        Без нее сброс запускается задачей цикла событий, ошибки пишутся в лог.
+        """
+        batch = self._pending.get(key)
+        if batch is not None:
+            batch.append(item)
+            return
+
+        self._pending[key] = [item]
+        if create_task is not None:
+            create_task(self._flush_later(key), update=item)
+            return
+
+        task = asyncio.get_running_loop().create_task(self._flush_later(key))
+        # Храним ссылку, чтобы задачу не удалил сборщик мусора
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Ошибка при обработке пачки: %s", task.exception(), exc_info=task.exception())
+
+    async def _flush_later(self, key: Hashable):
+        await asyncio.sleep(self.window)
+        batch = self._pending.pop(key, [])
+        self.batches += 1
+        self.items += len(batch)
+        await self.flush(key, batch)
+
+    def pending(self, key: Hashable) -> int:
+        """Возвращает количество элементов, ожидающих сброса"""
+        return len(self._pending.get(key, ()))
@@ -0,0 +1,84 @@
+"""
+Пропускная способность проверки отгадок на всплесках сообщений в одном чате.
+
+Сравнивает прежний путь (is_game_active + is_guessed + check_guess на каждое
+сообщение) с check_guesses по всей пачке на одной и той же записи всплесков.
+
+Запуск из корня проекта:
+    python -m benchmarks.burst_bench [--save-baseline]
+"""
+import random
+
+from benchmarks.common import Suite, run
+from benchmarks.crocodile_bench import make_game
+
+WRONG_GUESSES = ['кот', 'собака', 'может быть телефон?', 'ээээ', 'Холодильник!!!', 'не знаю', 'машина']
+
+
+def make_trace(bursts: int, burst_size: int, seed: int = 1):
+    """
+    Генерирует запись всплесков: для каждого чата слово ведущего
+    и список сообщений (user_id, text, message_id). Примерно в двух третях
+    всплесков слово отгадывают, причем после этого приходят еще сообщения.
+    """
+    rnd = random.Random(seed)
+    game = make_game()
+    trace = []
+    for chat_id in range(bursts):
+        game.start_game(chat_id)
+        word = game.set_host(chat_id, 1)
+        messages = [
+            (rnd.randint(2, 30), rnd.choice(WRONG_GUESSES), message_id)
+            for message_id in range(burst_size)
+        ]
+        if rnd.random() < 2 / 3:
+            position = rnd.randrange(burst_size)
+            user_id, _, message_id = messages[position]
+            messages[position] = (user_id, word.upper() + '!', message_id)
+        trace.append((chat_id, word, messages))
+    return trace
+
+
+def replay_setup(trace, batched: bool):
+    """Готовит свежую игру с теми же словами и возвращает op, воспроизводящий всплески"""
+
+    def setup():
+        game = make_game()
+        for chat_id, word, _ in trace:
+            game.start_game(chat_id)
+            game.set_host(chat_id, 1)
+            # Подменяем случайное слово на слово из записи
+            game.active_games[chat_id]['current_word'] = word
+            game.active_games[chat_id]['word_lower'] = game._normalize_word(word)
+        bursts = iter(trace)
+
+        def per_message():
+            chat_id, _, messages = next(bursts)
+            for user_id, text, _ in messages:
+                if not game.is_game_active(chat_id):
+                    continue
+                if game.is_guessed(chat_id):
+                    continue
+                game.check_guess(chat_id, user_id, text)
+
+        def batch():
+            chat_id, _, messages = next(bursts)
+            game.check_guesses(chat_id, messages)
+
+        return batch if batched else per_message
+
+    return setup
+
+
+def build_suite() -> Suite:
+    suite = Suite('burst')
+    for burst_size in (10, 50, 200):
+        bursts = 2000 if burst_size < 200 else 500
+        trace = make_trace(bursts, burst_size)
+        suite.add(f"burst_{burst_size}[per_message]", setup=replay_setup(trace, batched=False), number=bursts)
+        suite.add(f"burst_{burst_size}[check_guesses]", setup=replay_setup(trace, batched=True), number=bursts)
+    return suite
+
+
+if __name__ == '__main__':
+    run(build_suite())
@@ -0,0 +1,149 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+from typing import Callable, Dict, List, Optional
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# Во сколько раз замер может быть медленнее базового, прежде чем считать его регрессией
+DEFAULT_THRESHOLD = float(os.getenv('BENCH_THRESHOLD', '1.3'))
+
+
+class Case:
+    """Один замер: функция op выполняется number раз, всего repeat повторов"""
+
+    def __init__(self, name: str, op: Callable = None, setup: Callable = None,
+                 number: int = 1000, repeat: int = 5):
+        self.name = name
+        self.op = op
+        self.setup = setup  # Если задан, возвращает свежий op перед каждым повтором
+        self.number = number
+        self.repeat = repeat
+
+    def run(self) -> Dict:
+        timings = []
+        for _ in range(self.repeat):
+            op = self.setup() if self.setup is not None else self.op
+            start = time.perf_counter_ns()
+            for _ in range(self.number):
+                op()
+            timings.append((time.perf_counter_ns() - start) / self.number)
+
+        return {
+            'ns_per_op': statistics.median(timings),
+            'min_ns_per_op': min(timings),
+            'number': self.number,
+            'repeat': self.repeat,
+        }
+
+
+class Suite:
+    """Набор замеров с сохранением в JSON и сравнением с базовой линией"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.cases: List[Case] = []
+
+    def add(self, name: str, op: Callable = None, setup: Callable = None,
+            number: int = 1000, repeat: int = 5):
+        self.cases.append(Case(name, op=op, setup=setup, number=number, repeat=repeat))
+
+    def run(self, name_filter: Optional[str] = None) -> Dict[str, Dict]:
+        results = {}
+        for case in self.cases:
+            if name_filter and name_filter not in case.name:
+                continue
+            results[case.name] = case.run()
+            print(f"{case.name:<45} {format_ns(results[case.name]['ns_per_op']):>12}/op")
+        return results
+
+
+def format_ns(ns: float) -> str:
+    """Форматирует время в удобных единицах"""
+    for unit, scale in (('s', 1e9), ('ms', 1e6), ('us', 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """
+    Возвращает список замеров, которые медленнее базовой линии больше чем в threshold раз.
+    Сравнивается лучший повтор, он меньше всего зависит от фоновой нагрузки.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = result['min_ns_per_op'] / base['min_ns_per_op']
+        if ratio > threshold:
+            regressions.append(
+                f"{name}: {format_ns(result['min_ns_per_op'])} vs {format_ns(base['min_ns_per_op'])} (x{ratio:.2f})"
+            )
+    return regressions
+
+
+def main(suite: Suite, argv: Optional[List[str]] = None) -> int:
+    """
+    Запускает набор замеров из командной строки.
+
+    Результаты пишутся в benchmarks/results/<suite>.json. Если есть базовая
+    линия benchmarks/results/<suite>.baseline.json, результаты сравниваются
+    с ней и запуск завершается с кодом 1 при регрессии.
+    """
+    parser = argparse.ArgumentParser(description=f"Бенчмарки {suite.name}")
+    parser.add_argument('--baseline', help="Файл базовой линии")
+    parser.add_argument('--output', help="Файл для результатов")
+    parser.add_argument('--save-baseline', action='store_true', help="Сохранить результаты как базовую линию")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Допустимое замедление относительно базовой линии (по умолчанию %(default)s)")
+    parser.add_argument('--filter', help="Запускать только замеры, содержащие подстроку")
+    args = parser.parse_args(argv)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    baseline_path = args.baseline or os.path.join(RESULTS_DIR, f"{suite.name}.baseline.json")
+    output_path = args.output or os.path.join(RESULTS_DIR, f"{suite.name}.json")
+
+    results = suite.run(args.filter)
+    report = {
+        'suite': suite.name,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.save_baseline:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Базовая линия сохранена: {baseline_path}")
+        return 0
+
+    if not os.path.exists(baseline_path):
+        print(f"Базовая линия не найдена ({baseline_path}), сравнение пропущено")
+        return 0
+
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nРегрессии (порог x{args.threshold}):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+
+    print(f"\nРегрессий нет (порог x{args.threshold})")
+    return 0
+
+
+def run(suite: Suite):
+    sys.exit(main(suite))
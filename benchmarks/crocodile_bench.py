@@ -0,0 +1,143 @@
+"""
+Бенчмарки движка CrocodileGame без Telegram.
+
+Запуск из корня проекта:
+    python -m benchmarks.crocodile_bench [--save-baseline] [--threshold 1.3]
+"""
+import os
+import json
+import atexit
+import random
+import shutil
+import tempfile
+import itertools
+
+from benchmarks.common import Suite, run
+from games import CrocodileGame
+
+TMP_DIR = tempfile.mkdtemp(prefix='crocodile_bench_')
+atexit.register(shutil.rmtree, TMP_DIR, ignore_errors=True)
+
+
+def make_game(autosave: bool = False, scores_file: str = None) -> CrocodileGame:
+    """Создает игру с отдельным файлом очков во временной папке"""
+    scores_file = scores_file or os.path.join(TMP_DIR, 'scores.json')
+    return CrocodileGame(scores_file=scores_file, autosave=autosave)
+
+
+def make_scores_file(chats: int, users_per_chat: int = 5) -> str:
+    """Генерирует scores.json в формате save_scores с заданным числом чатов"""
+    path = os.path.join(TMP_DIR, f"scores_{chats}.json")
+    if os.path.exists(path):
+        return path
+
+    rnd = random.Random(chats)
+    data = {}
+    for i in range(chats):
+        chat_id = -1001000000000 - i
+        data[str(chat_id)] = {
+            str(rnd.randint(10 ** 8, 10 ** 10)): rnd.randint(1, 500)
+            for _ in range(users_per_chat)
+        }
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def setup_started_game():
+    """Каждый вызов op запускает игру в новом чате"""
+    game = make_game()
+    chat_ids = itertools.count(1)
+    return lambda: game.start_game(next(chat_ids))
+
+
+def setup_set_host():
+    game = make_game()
+    game.start_game(1)
+    return lambda: game.set_host(1, 42)
+
+
+def setup_guess(text: str):
+    game = make_game()
+    game.start_game(1)
+    game.set_host(1, 42)
+    return lambda: game.check_guess(1, 7, text)
+
+
+def setup_correct_guess(number: int):
+    """Готовит number чатов с ведущим, каждый вызов op отгадывает слово в следующем"""
+    game = make_game()
+    words = []
+    for chat_id in range(number):
+        game.start_game(chat_id)
+        words.append(game.set_host(chat_id, 42))
+    guesses = iter(enumerate(words))
+
+    def op():
+        chat_id, word = next(guesses)
+        game.check_guess(chat_id, 7, word)
+
+    return op
+
+
+def setup_timeout_sweep(chats: int):
+    """Проход check_timeout по всем активным чатам, как в check_game_timeouts"""
+    game = make_game()
+    for chat_id in range(chats):
+        game.start_game(chat_id)
+        game.set_host(chat_id, 42)
+
+    def op():
+        for chat_id in list(game.active_games.keys()):
+            game.check_timeout(chat_id)
+
+    return op
+
+
+def setup_add_score(autosave: bool, chats: int = 100):
+    game = make_game(autosave=autosave, scores_file=os.path.join(TMP_DIR, f"add_score_{autosave}.json"))
+    for chat_id in range(chats):
+        game.add_score(chat_id, 1, 1)
+    counter = itertools.count()
+    return lambda: game.add_score(next(counter) % chats, 7, 1)
+
+
+def setup_resident_get_score(hit: bool, chats: int = 2000):
+    """get_score в режиме вытеснения: все чаты в памяти (hit) или каждый раз из SQLite (miss)"""
+    scores_db = os.path.join(TMP_DIR, f"resident_{hit}.db")
+    game = CrocodileGame(scores_file=os.path.join(TMP_DIR, 'missing.json'), scores_db=scores_db,
+                         autosave=False, max_resident_chats=chats if hit else 1)
+    for chat_id in range(chats):
+        game.add_score(chat_id, 1, 1)
+    game.save_scores()
+    counter = itertools.count()
+    return lambda: game.get_score(next(counter) % chats, 1)
+
+
+def setup_load_scores(chats: int):
+    game = make_game(scores_file=make_scores_file(chats))
+    return game.load_scores
+
+
+def build_suite() -> Suite:
+    suite = Suite('crocodile')
+    long_text = 'очень длинное сообщение, совсем не похожее на загаданное слово! ' * 30
+
+    suite.add('start_game', setup=setup_started_game, number=10000)
+    suite.add('set_host', setup=setup_set_host, number=10000)
+    suite.add('check_guess[correct]', setup=lambda: setup_correct_guess(5000), number=5000)
+    suite.add('check_guess[wrong]', setup=lambda: setup_guess('Неправильно'), number=10000)
+    suite.add('check_guess[long_text]', setup=lambda: setup_guess(long_text), number=2000)
+    suite.add('check_timeout[sweep_1k]', setup=lambda: setup_timeout_sweep(1000), number=50)
+    suite.add('add_score[autosave_off]', setup=lambda: setup_add_score(False), number=10000)
+    suite.add('add_score[autosave_on]', setup=lambda: setup_add_score(True), number=200)
+    suite.add('get_score[resident_hit]', setup=lambda: setup_resident_get_score(True), number=10000)
+    suite.add('get_score[resident_miss]', setup=lambda: setup_resident_get_score(False), number=2000)
+    suite.add('load_scores[10k]', setup=lambda: setup_load_scores(10000), number=1, repeat=3)
+    suite.add('load_scores[100k]', setup=lambda: setup_load_scores(100000), number=1, repeat=3)
+    return suite
+
+
+if __name__ == '__main__':
+    run(build_suite())
@@ -0,0 +1,181 @@
+"""
+Нагрузочный тест профилей default и performance через настоящий Application.
+
+Bot API заменяется локальным HTTP-сервером, который отвечает с задержкой
+LATENCY, как удаленный api.telegram.org. Обновления (Update.de_json)
+кладутся в update_queue приложения, собранного так же, как в bot.py
+(с apply_runtime_profile), и обработчик отвечает на каждое через
+reply_text - то есть запросы идут через настроенные HTTPXRequest, пулы
+соединений и таймауты профиля.
+
+Замеры:
+    load[default]                - Application.builder() без профиля
+    load[performance]            - RUNTIME_PROFILE=performance с настройками по умолчанию
+    load[performance_concurrent] - то же и RUNTIME_CONCURRENT_UPDATES=256
+
+Запуск из корня проекта:
+    python -m benchmarks.runtime_bench [--save-baseline]
+"""
+import gc
+import os
+import json
+import asyncio
+import logging
+import threading
+from typing import Optional
+
+from telegram import Update
+from telegram.ext import Application, MessageHandler, filters
+
+from benchmarks.common import Suite, run
+from runtime import DEFAULT_PROFILE, PERFORMANCE_PROFILE, apply_runtime_profile
+
+UPDATES = 200
+CHATS = 20
+LATENCY = 0.005  # Задержка ответа Bot API, секунд
+
+BOT_USER = {'id': 1, 'is_bot': True, 'first_name': 'bench', 'username': 'bench_bot'}
+
+
+class MockBotApi:
+    """HTTP-сервер Bot API в отдельном потоке: getMe - пользователь бота, остальные методы - сообщение"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.requests = 0
+        self._loop = asyncio.new_event_loop()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    def start(self) -> str:
+        """Запускает сервер и возвращает base_url для ApplicationBuilder"""
+        self._thread.start()
+        self._server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self._serve, '127.0.0.1', 0), self._loop
+        ).result()
+        port = self._server.sockets[0].getsockname()[1]
+        return f'http://127.0.0.1:{port}/bot'
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._server.close)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # Соединения keep-alive: читаем запросы, пока клиент не закроет соединение
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                length = 0
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    if name.strip().lower() == 'content-length':
+                        length = int(value)
+                if length:
+                    await reader.readexactly(length)
+
+                self.requests += 1
+                await asyncio.sleep(self.latency)
+                method = request_line.split()[1].rsplit(b'/', 1)[-1]
+                body = json.dumps({'ok': True, 'result': self._result(method)}).encode()
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                    b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n' + body
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _result(self, method: bytes):
+        if method == b'getMe':
+            return BOT_USER
+        return {
+            'message_id': self.requests, 'date': 0, 'text': 'ok', 'from': BOT_USER,
+            'chat': {'id': -1, 'type': 'supergroup', 'title': 'bench'},
+        }
+
+
+def make_update(update_id: int) -> dict:
+    chat_id = -1000 - update_id % CHATS
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id, 'date': 0, 'text': f'отгадка {update_id}',
+            'chat': {'id': chat_id, 'type': 'supergroup', 'title': f'chat{chat_id}'},
+            'from': {'id': 2 + update_id % 50, 'is_bot': False, 'first_name': 'user'},
+        },
+    }
+
+
+async def process_updates(application: Application):
+    """Прогоняет UPDATES обновлений через приложение и ждет ответа на каждое"""
+    done = asyncio.Event()
+    handled = 0
+
+    async def reply(update: Update, context):
+        nonlocal handled
+        await update.message.reply_text('принято')
+        handled += 1
+        if handled == UPDATES:
+            done.set()
+
+    application.add_handler(MessageHandler(filters.TEXT, reply))
+    async with application:
+        await application.start()
+        for update_id in range(UPDATES):
+            await application.update_queue.put(Update.de_json(make_update(update_id), application.bot))
+        await done.wait()
+        await application.stop()
+
+
+def run_load(base_url: str, profile: str, concurrent_updates: int = 0):
+    """Собирает приложение, как bot.py, и прогоняет нагрузку"""
+    old_policy = asyncio.get_event_loop_policy()
+    old_threshold = gc.get_threshold()
+    old_env = os.environ.get('RUNTIME_CONCURRENT_UPDATES')
+    os.environ['RUNTIME_CONCURRENT_UPDATES'] = str(concurrent_updates)
+    try:
+        builder = Application.builder().token('1:bench').base_url(base_url).updater(None)
+        application = apply_runtime_profile(builder, profile).build()
+        asyncio.run(process_updates(application))
+    finally:
+        if old_env is None:
+            os.environ.pop('RUNTIME_CONCURRENT_UPDATES', None)
+        else:
+            os.environ['RUNTIME_CONCURRENT_UPDATES'] = old_env
+        asyncio.set_event_loop_policy(old_policy)
+        gc.set_threshold(*old_threshold)
+
+
+def build_suite(base_url: str) -> Suite:
+    suite = Suite('runtime')
+    cases = (
+        ('load[default]', DEFAULT_PROFILE, 0),
+        ('load[performance]', PERFORMANCE_PROFILE, 0),
+        ('load[performance_concurrent]', PERFORMANCE_PROFILE, 256),
+    )
+    for name, profile, concurrent_updates in cases:
+        suite.add(
+            name,
+            op=lambda profile=profile, concurrent_updates=concurrent_updates: run_load(
+                base_url, profile, concurrent_updates
+            ),
+            number=1, repeat=5
+        )
+    return suite
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    api = MockBotApi(LATENCY)
+    try:
+        run(build_suite(api.start()))
+    finally:
+        api.stop()
@@ -0,0 +1,54 @@
+"""
+Время холодного старта статистики: scores.json против бинарного формата.
+
+Запуск из корня проекта:
+    python -m benchmarks.startup_bench [--save-baseline]
+"""
+import os
+
+from benchmarks.common import Suite, run
+from benchmarks.crocodile_bench import make_scores_file
+from games import CrocodileGame
+from games.binary_scores import BinaryScoreFile, read_json_scores, write_binary_scores
+
+
+def make_binary_file(chats: int) -> str:
+    """Конвертирует сгенерированный scores.json в бинарный формат"""
+    json_path = make_scores_file(chats)
+    bin_path = json_path[:-len('.json')] + '.bin'
+    if not os.path.exists(bin_path):
+        write_binary_scores(bin_path, read_json_scores(json_path))
+        print(f"{chats} чатов: json {os.path.getsize(json_path) // 1024} КБ, "
+              f"bin {os.path.getsize(bin_path) // 1024} КБ")
+    return bin_path
+
+
+def setup_single_chat(chats: int):
+    """Открытие файла и чтение одного чата без разбора остальных"""
+    path = make_binary_file(chats)
+    with BinaryScoreFile(path) as score_file:
+        chat_id = next(score_file.chat_ids())
+
+    def op():
+        with BinaryScoreFile(path) as score_file:
+            score_file.load_chat(chat_id)
+
+    return op
+
+
+def build_suite() -> Suite:
+    suite = Suite('startup')
+    for chats in (10000, 100000):
+        label = f"{chats // 1000}k"
+        suite.add(f"init[json_{label}]",
+                  setup=lambda chats=chats: lambda: CrocodileGame(scores_file=make_scores_file(chats)),
+                  number=1, repeat=3)
+        suite.add(f"init[bin_{label}]",
+                  setup=lambda chats=chats: lambda: CrocodileGame(scores_file=make_binary_file(chats)),
+                  number=1, repeat=3)
+        suite.add(f"load_chat[bin_{label}]", setup=lambda chats=chats: setup_single_chat(chats), number=1000)
+    return suite
+
+
+if __name__ == '__main__':
+    run(build_suite())
@@ -0,0 +1,54 @@
+"""
+Бенчмарки игры Слова: индекс словаря и ходы в сотнях параллельных чатов.
+
+Запуск из корня проекта:
+    python -m benchmarks.word_chain_bench [--save-baseline]
+"""
+import random
+import itertools
+
+from benchmarks.common import Suite, run
+from games import WordChainGame
+from games.words import WORDS
+from games.word_chain import WordIndex, normalize_word
+
+
+def setup_chains(chats: int):
+    """Каждый вызов op - правильный ход в следующем из chats чатов"""
+    game = WordChainGame()
+    words = list(game.index.iter_prefix(''))
+    for chat_id in range(chats):
+        game.start_game(chat_id)
+    chat_ids = itertools.cycle(range(chats))
+    user_ids = itertools.cycle((1, 2))
+    rnd = random.Random(1)
+
+    def op():
+        chat_id = next(chat_ids)
+        letter = game.get_last_letter(chat_id)
+        word = game.hint(chat_id) if letter else rnd.choice(words)
+        if word is None:
+            game.stop_game(chat_id)
+            game.start_game(chat_id)
+            return
+        game.play_word(chat_id, next(user_ids), word)
+
+    return op
+
+
+def build_suite() -> Suite:
+    suite = Suite('word_chain')
+    index = WordIndex(WORDS)
+    words = [normalize_word(word) for word in WORDS]
+    misses = [word + 'х' for word in words]
+
+    suite.add('build_index', op=lambda: WordIndex(WORDS), number=5)
+    suite.add('contains[hit]', op=lambda: [word in index for word in words], number=20)
+    suite.add('contains[miss]', op=lambda: [word in index for word in misses], number=20)
+    suite.add('count_starting_with', op=lambda: index.count_starting_with('к'), number=100000)
+    suite.add('play_word[500_chats]', setup=lambda: setup_chains(500), number=5000)
+    return suite
+
+
+if __name__ == '__main__':
+    run(build_suite())
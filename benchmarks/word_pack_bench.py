@@ -0,0 +1,71 @@
+"""
+Наборы слов .pack через mmap против списка строк в памяти.
+
+Запуск из корня проекта:
+    python -m benchmarks.word_pack_bench [--save-baseline]
+"""
+import os
+import random
+import tracemalloc
+
+from benchmarks.common import Suite, run
+from benchmarks.crocodile_bench import TMP_DIR
+from games.words import WORDS
+from games.word_packs import MappedWordPack, read_word_source, write_word_pack
+
+
+def make_pack_files(count: int):
+    """Генерирует исходник из count слов и собирает из него .pack"""
+    source = os.path.join(TMP_DIR, f"words_{count}.txt")
+    target = os.path.join(TMP_DIR, f"words_{count}.pack")
+    if os.path.exists(target):
+        return source, target
+
+    with open(source, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            f.write(f"{WORDS[i % len(WORDS)]} {i}\n")
+    write_word_pack(target, read_word_source(source)[1], 'bench')
+
+    # Память Python-объектов: список строк против открытого набора
+    tracemalloc.start()
+    words = read_word_source(source)[1]
+    list_bytes = tracemalloc.get_traced_memory()[0]
+    del words
+    tracemalloc.stop()
+    tracemalloc.start()
+    pack = MappedWordPack(target)
+    pack_bytes = tracemalloc.get_traced_memory()[0]
+    pack.close()
+    tracemalloc.stop()
+    print(f"{count} слов: список {list_bytes // 1024} КБ, pack {pack_bytes // 1024} КБ (без страниц mmap)")
+    return source, target
+
+
+def setup_open_pack(count: int):
+    _, target = make_pack_files(count)
+    return lambda: MappedWordPack(target).close()
+
+
+def setup_read_source(count: int):
+    source, _ = make_pack_files(count)
+    return lambda: read_word_source(source)
+
+
+def setup_random_word(count: int):
+    _, target = make_pack_files(count)
+    pack = MappedWordPack(target)
+    return lambda: random.choice(pack)
+
+
+def build_suite() -> Suite:
+    suite = Suite('word_packs')
+    count = 100000
+    suite.add('open[pack_100k]', setup=lambda: setup_open_pack(count), number=1000)
+    suite.add('read_source[txt_100k]', setup=lambda: setup_read_source(count), number=1, repeat=3)
+    suite.add('random_word[pack_100k]', setup=lambda: setup_random_word(count), number=10000)
+    suite.add('random_word[WORDS]', op=lambda: random.choice(WORDS), number=10000)
+    return suite
+
+
+if __name__ == '__main__':
+    run(build_suite())
@@ -1,4 +1,5 @@
 import os
+import html
 import asyncio
 import logging
 from dotenv import load_dotenv
@@ -8,24 +9,66 @@ from telegram.ext import (
     Application,
     CommandHandler,
     CallbackQueryHandler,
+    ChatMemberHandler,
     MessageHandler,
     ContextTypes,
     filters
 )
-from games import CrocodileGame
+from games import CrocodileGame, WordChainGame
+from logging_config import setup_logging, log_handler
+from batching import MicroBatcher
+from rate_limit import FloodControl
+from render_cache import VersionedCache
+from admin_cache import ChatAdminCache
+from runtime import PERFORMANCE_PROFILE, apply_runtime_profile, freeze_gc, get_profile
 
 # Загрузка переменных окружения
 load_dotenv()
 
-# Настройка логирования
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
+# Настройка логирования (запись в фоновом потоке)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # Экземпляр игры
-crocodile_game = CrocodileGame()
+# SCORES_MAX_RESIDENT_CHATS / SCORES_MAX_RESIDENT_ENTRIES > 0 ограничивают число чатов
+# (или записей "игрок - очки") в памяти, остальные хранятся в scores.db
+# SCORES_FILE с расширением .bin - компактный бинарный формат вместо JSON
+crocodile_game = CrocodileGame(
+    scores_file=os.getenv('SCORES_FILE'),
+    max_resident_chats=int(os.getenv('SCORES_MAX_RESIDENT_CHATS', '0')),
+    max_resident_entries=int(os.getenv('SCORES_MAX_RESIDENT_ENTRIES', '0')),
+    word_packs_dir=os.getenv('WORD_PACKS_DIR', 'packs'),
+    packs_file=os.getenv('CHAT_PACKS_FILE')
+)
+
+# Игра Слова: индекс словаря общий для всех чатов
+word_chain_game = WordChainGame()
+
+# Окно сбора отгадок одного чата в пачку (0 - проверять каждое сообщение сразу)
+GUESS_BATCH_WINDOW = float(os.getenv('GUESS_BATCH_WINDOW_MS', '50')) / 1000
+
+# Защита от флуда: событий в секунду и допустимый всплеск для игрока и для чата (0 - без ограничения)
+guess_flood = FloodControl(
+    user_rate=float(os.getenv('FLOOD_GUESS_USER_RATE', '3')),
+    user_burst=float(os.getenv('FLOOD_GUESS_USER_BURST', '5')),
+    chat_rate=float(os.getenv('FLOOD_GUESS_CHAT_RATE', '30')),
+    chat_burst=float(os.getenv('FLOOD_GUESS_CHAT_BURST', '60'))
+)
+# Готовый текст таблицы лидеров по чатам, актуален до следующего изменения очков
+leaderboard_cache = VersionedCache(max_size=int(os.getenv('LEADERBOARD_CACHE_SIZE', '1000')))
+
+# Администраторы чатов: список запрашивается один раз и обновляется по событиям chat_member
+admin_cache = ChatAdminCache(
+    ttl=float(os.getenv('ADMIN_CACHE_TTL', '600')),
+    max_size=int(os.getenv('ADMIN_CACHE_SIZE', '10000'))
+)
+
+host_flood = FloodControl(
+    user_rate=float(os.getenv('FLOOD_HOST_USER_RATE', '0.5')),
+    user_burst=float(os.getenv('FLOOD_HOST_USER_BURST', '2')),
+    chat_rate=float(os.getenv('FLOOD_HOST_CHAT_RATE', '2')),
+    chat_burst=float(os.getenv('FLOOD_HOST_CHAT_BURST', '5'))
+)
 
 
 def get_game_keyboard(chat_id: int, user_id: int = None) -> InlineKeyboardMarkup:
@@ -82,6 +125,7 @@ async def choose_game(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     keyboard = [
         [InlineKeyboardButton("🐊 Крокодил", callback_data='game_crocodile')],
+        [InlineKeyboardButton("🔤 Слова", callback_data='game_word_chain')],
     ]
     reply_markup = InlineKeyboardMarkup(keyboard)
     
@@ -98,6 +142,10 @@ async def start_crocodile(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = update.effective_chat.id
     user_id = update.effective_user.id
     
+    if word_chain_game.is_game_active(chat_id):
+        await query.answer("⚠️ В чате уже идет игра Слова. Останови ее командой /stop", show_alert=True)
+        return
+    
     if crocodile_game.is_game_active(chat_id):
         reply_markup = get_game_keyboard(chat_id, user_id)
         
@@ -131,6 +179,35 @@ async def start_crocodile(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
 
+async def start_word_chain(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Начинает игру Слова"""
+    query = update.callback_query
+    
+    chat_id = update.effective_chat.id
+    
+    if crocodile_game.is_game_active(chat_id):
+        await query.answer("⚠️ В чате уже идет игра Крокодил. Останови ее командой /stop", show_alert=True)
+        return
+    
+    await query.answer()
+    
+    if not word_chain_game.start_game(chat_id):
+        letter = word_chain_game.get_last_letter(chat_id)
+        await query.edit_message_text(
+            "🔤 Игра Слова уже идет!\n\n" +
+            (f"Следующее слово на букву <b>{letter.upper()}</b>." if letter else "Назовите любое слово."),
+            parse_mode='HTML'
+        )
+        return
+    
+    await query.edit_message_text(
+        "🔤 Игра Слова началась!\n\n"
+        "Каждое следующее слово должно начинаться на последнюю букву предыдущего. "
+        "Называть слова подряд одному игроку нельзя, повторяться тоже.\n\n"
+        "Назовите любое слово! Подсказка: /hint"
+    )
+
+
 async def show_word(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Показывает слово ведущему во всплывающем окне"""
     query = update.callback_query
@@ -166,6 +243,11 @@ async def become_host(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = update.effective_chat.id
     user_id = update.effective_user.id
     
+    # Частые нажатия не доходят до set_host и edit_message_text
+    if not host_flood.allow(chat_id, user_id):
+        await query.answer("⏳ Слишком часто! Подожди немного.")
+        return
+    
     if not crocodile_game.is_game_active(chat_id):
         await query.answer("❌ Игра не активна. Начни новую игру!", show_alert=True)
         return
@@ -228,6 +310,11 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if text.startswith('/'):
         return
     
+    if word_chain_game.is_game_active(chat_id):
+        if guess_flood.allow(chat_id, user_id):
+            await handle_word_chain_move(update, chat_id, user_id, text)
+        return
+    
     # Проверяем, активна ли игра
     if not crocodile_game.is_game_active(chat_id):
         return
@@ -236,45 +323,216 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if crocodile_game.is_guessed(chat_id):
         return
     
-    # Проверяем отгадку
-    is_correct, is_host = crocodile_game.check_guess(chat_id, user_id, text)
+    # Сообщения сверх лимита игрока или чата не проверяются
+    if not guess_flood.allow(chat_id, user_id):
+        return
     
-    if is_correct:
-        # Слово отгадано!
-        guesser_name = update.effective_user.username or update.effective_user.first_name
-        current_score = crocodile_game.get_score(chat_id, user_id)
-        
-        reply_markup = get_game_keyboard(chat_id, user_id)
-        
+    # Отгадки одного чата собираются в пачку и проверяются за один проход.
+    # Пачка проверяется задачей приложения: ее ошибки (RetryAfter, NetworkError)
+    # попадают в error_handler, а при остановке бота пачка не теряется
+    if GUESS_BATCH_WINDOW > 0:
+        guess_batcher.add(chat_id, update, create_task=context.application.create_task)
+    else:
+        await resolve_guesses(chat_id, [update])
+
+
+async def resolve_guesses(chat_id: int, updates: list):
+    """Проверяет пачку отгадок и поздравляет первого, кто отгадал"""
+    guesses = [
+        (update.effective_user.id, update.message.text, update.message.message_id)
+        for update in updates
+    ]
+    
+    winner = crocodile_game.check_guesses(chat_id, guesses)
+    if winner is None:
+        return
+    
+    user_id, message_id = winner
+    update = next(u for u in updates if u.message.message_id == message_id)
+    
+    # Слово отгадано!
+    guesser_name = update.effective_user.username or update.effective_user.first_name
+    current_score = crocodile_game.get_score(chat_id, user_id)
+    
+    reply_markup = get_game_keyboard(chat_id, user_id)
+    
+    await update.message.reply_text(
+        f"🎉 Ты отгадал, @{guesser_name}!\n\n"
+        f"💯 Твои очки: <b>{current_score}</b>\n"
+        f"Посмотреть статистику: /stats",
+        reply_markup=reply_markup,
+        parse_mode='HTML'
+    )
+    
+    # Удаляем сообщение с отгадкой (опционально, можно закомментировать)
+    # try:
+    #     await update.message.delete()
+    # except Exception as e:
+    #     logger.warning("Не удалось удалить сообщение: %s", e)
+
+
+# Сборщик отгадок: пачка каждого чата проверяется через resolve_guesses
+guess_batcher = MicroBatcher(GUESS_BATCH_WINDOW, resolve_guesses)
+
+
+async def handle_word_chain_move(update: Update, chat_id: int, user_id: int, text: str):
+    """Проверяет ход в игре Слова"""
+    result, letter = word_chain_game.play_word(chat_id, user_id, text)
+    
+    # Обычные сообщения чата, не являющиеся словами из словаря, игнорируем
+    if result == WordChainGame.NOT_A_WORD:
+        return
+    
+    if result == WordChainGame.WRONG_LETTER:
+        await update.message.reply_text(f"❌ Нужно слово на букву <b>{letter.upper()}</b>!", parse_mode='HTML')
+        return
+    
+    if result == WordChainGame.SAME_PLAYER:
+        await update.message.reply_text("⏳ Дай сходить другим игрокам!")
+        return
+    
+    if result == WordChainGame.ALREADY_USED:
+        await update.message.reply_text("🔁 Это слово уже называли!")
+        return
+    
+    if letter is None or word_chain_game.remaining(chat_id, letter) <= 0:
+        moves = word_chain_game.get_moves(chat_id)
+        word_chain_game.stop_game(chat_id)
         await update.message.reply_text(
-            f"🎉 Ты отгадал, @{guesser_name}!\n\n"
-            f"💯 Твои очки: <b>{current_score}</b>\n"
-            f"Посмотреть статистику: /stats",
-            reply_markup=reply_markup,
+            f"🏁 Слов на букву <b>{letter.upper() if letter else '?'}</b> больше нет!\n\n"
+            f"Игра окончена, всего названо слов: <b>{moves}</b>.",
             parse_mode='HTML'
         )
-        
-        # Удаляем сообщение с отгадкой (опционально, можно закомментировать)
-        # try:
-        #     await update.message.delete()
-        # except Exception as e:
-        #     logger.warning(f"Не удалось удалить сообщение: {e}")
+        return
+    
+    await update.message.reply_text(
+        f"✅ Принято! Следующее слово на букву <b>{letter.upper()}</b> "
+        f"(осталось {word_chain_game.remaining(chat_id, letter)})",
+        parse_mode='HTML'
+    )
+
+
+async def word_chain_hint(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Подсказка в игре Слова: первая буква и длина незанятого слова"""
+    chat_id = update.effective_chat.id
+    
+    if not word_chain_game.is_game_active(chat_id):
+        await update.message.reply_text("❌ Игра Слова не активна.")
+        return
+    
+    word = word_chain_game.hint(chat_id)
+    if word is None:
+        await update.message.reply_text("💡 Назовите любое слово!")
+        return
+    
+    masked = word[0].upper() + ''.join(' ' if char == ' ' else '•' for char in word[1:])
+    await update.message.reply_text(f"💡 Подсказка: {masked} ({len(word.replace(' ', ''))} букв)")
+
+
+async def is_chat_admin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> bool:
+    """Проверяет права администратора автора сообщения (в личке права есть всегда)"""
+    chat = update.effective_chat
+    if chat.type not in ['group', 'supergroup']:
+        return True
+    
+    # Анонимный администратор пишет от имени самого чата
+    sender_chat = update.message.sender_chat if update.message else None
+    if sender_chat is not None and sender_chat.id == chat.id:
+        return True
+    
+    return await admin_cache.is_admin(context.bot, chat.id, update.effective_user.id)
+
+
+async def require_admin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> bool:
+    """Отвечает отказом, если автор команды не администратор"""
+    if await is_chat_admin(update, context):
+        return True
+    await update.message.reply_text("⛔ Эта команда доступна только администраторам чата.")
+    return False
+
+
+async def chat_member_update(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Обновляет кэш администраторов при изменении прав участников"""
+    if update.my_chat_member is not None:
+        # Изменились права самого бота - с ними могли измениться и доступные ему события
+        admin_cache.invalidate(update.my_chat_member.chat.id)
+        return
+    
+    member_update = update.chat_member
+    if member_update is None:
+        return
+    
+    new_member = member_update.new_chat_member
+    admin_cache.update_member(member_update.chat.id, new_member.user.id, new_member.status)
 
 
 async def stop_game(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Останавливает игру (только для админов или в личке)"""
     chat_id = update.effective_chat.id
     
+    if not await require_admin(update, context):
+        return
+    
     if crocodile_game.is_game_active(chat_id):
         crocodile_game.stop_game(chat_id)
         await update.message.reply_text("🛑 Игра остановлена.")
+    elif word_chain_game.is_game_active(chat_id):
+        word_chain_game.stop_game(chat_id)
+        await update.message.reply_text("🛑 Игра остановлена.")
     else:
         await update.message.reply_text("❌ Игра не активна.")
 
 
+async def reset_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Сбрасывает статистику очков в чате (только для админов или в личке)"""
+    chat_id = update.effective_chat.id
+    
+    if not await require_admin(update, context):
+        return
+    
+    crocodile_game.reset_scores(chat_id)
+    await update.message.reply_text("🧹 Статистика очков в чате сброшена.")
+
+
+async def choose_pack(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Показывает наборы слов или выбирает набор для чата: /pack [имя] (выбор - только для админов)"""
+    chat_id = update.effective_chat.id
+    
+    if context.args:
+        if not await require_admin(update, context):
+            return
+        name = context.args[0]
+        if crocodile_game.set_word_pack(chat_id, name):
+            await update.message.reply_text(
+                f"📚 Выбран набор слов <b>{html.escape(name)}</b>. Он будет использоваться со следующего слова.",
+                parse_mode='HTML'
+            )
+        else:
+            await update.message.reply_text(f"❌ Набор слов «{name}» не найден. Список наборов: /pack")
+        return
+    
+    current = crocodile_game.get_word_pack(chat_id)
+    text = "📚 <b>Наборы слов:</b>\n\n"
+    for name, title, count in crocodile_game.get_word_pack_info():
+        marker = "✅" if name == current else "▫️"
+        text += f"{marker} <code>{html.escape(name)}</code> - {html.escape(title)} ({count} слов)\n"
+    text += "\nВыбрать набор: /pack &lt;имя&gt;"
+    
+    await update.message.reply_text(text, parse_mode='HTML')
+
+
 async def show_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Показывает статистику по очкам в группе"""
     chat_id = update.effective_chat.id
+    
+    # Версию берем до запроса очков: если очки изменятся во время сборки,
+    # текст сохранится под старой версией и будет собран заново
+    version = crocodile_game.get_score_version(chat_id)
+    stats_text = leaderboard_cache.get(chat_id, version)
+    if stats_text is not None:
+        await update.message.reply_text(stats_text, parse_mode='HTML')
+        return
+    
     scores = crocodile_game.get_all_scores(chat_id)
     
     if not scores:
@@ -286,6 +544,7 @@ async def show_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     # Формируем текст статистики
     stats_text = "📊 <b>Таблица лидеров:</b>\n\n"
+    complete = True  # Все имена получены - текст можно кэшировать
     
     for rank, (user_id, score) in enumerate(sorted_scores, 1):
         try:
@@ -303,10 +562,17 @@ async def show_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
             stats_text += f"{medal} {display_name}: <b>{score}</b> очков\n"
         except Exception as e:
             # Если не удалось получить информацию о пользователе, используем ID
-            logger.warning(f"Не удалось получить информацию о пользователе {user_id}: {e}")
+            logger.warning(
+                "Не удалось получить информацию о пользователе %s: %s", user_id, e,
+                extra={'chat_id': chat_id, 'user_id': user_id, 'handler': 'show_stats'}
+            )
             medal = "🥇" if rank == 1 else "🥈" if rank == 2 else "🥉" if rank == 3 else f"{rank}."
             stats_text += f"{medal} ID{user_id}: <b>{score}</b> очков\n"
+            complete = False
     
+    # Текст с ID вместо имен не кэшируем, чтобы следующий /stats попробовал снова
+    if complete:
+        leaderboard_cache.put(chat_id, version, stats_text)
     await update.message.reply_text(stats_text, parse_mode='HTML')
 
 
@@ -340,14 +606,78 @@ async def check_game_timeouts(context: ContextTypes.DEFAULT_TYPE):
                         parse_mode='HTML'
                     )
                 except Exception as e:
-                    logger.warning(f"Не удалось отправить сообщение о таймауте в чат {chat_id}: {e}")
+                    logger.warning(
+                        "Не удалось отправить сообщение о таймауте в чат %s: %s", chat_id, e,
+                        extra={'chat_id': chat_id, 'handler': 'check_game_timeouts'}
+                    )
                 
                 # Завершаем игру
                 crocodile_game.stop_game(chat_id)
-                logger.info(f"Игра завершена по таймауту в чате {chat_id}")
+                logger.info(
+                    "Игра завершена по таймауту в чате %s", chat_id,
+                    extra={'chat_id': chat_id, 'handler': 'check_game_timeouts'}
+                )
+        
+        # Игры Слова, в которых давно никто не называл слов
+        for chat_id in list(word_chain_game.active_games.keys()):
+            if not word_chain_game.check_timeout(chat_id):
+                continue
+            
+            moves = word_chain_game.get_moves(chat_id)
+            word_chain_game.stop_game(chat_id)
+            try:
+                await context.bot.send_message(
+                    chat_id=chat_id,
+                    text=(
+                        f"⏰ <b>Время истекло!</b>\n\n"
+                        f"Никто не назвал слово за 10 минут.\n"
+                        f"Игра окончена, всего названо слов: <b>{moves}</b>.\n\n"
+                        f"Чтобы начать новую игру, отправьте /start"
+                    ),
+                    parse_mode='HTML'
+                )
+            except Exception as e:
+                logger.warning(
+                    "Не удалось отправить сообщение о таймауте в чат %s: %s", chat_id, e,
+                    extra={'chat_id': chat_id, 'handler': 'check_game_timeouts'}
+                )
+            logger.info(
+                "Игра Слова завершена по таймауту в чате %s", chat_id,
+                extra={'chat_id': chat_id, 'handler': 'check_game_timeouts'}
+            )
                 
     except Exception as e:
-        logger.error(f"Ошибка при проверке таймеров: {e}")
+        logger.error("Ошибка при проверке таймеров: %s", e, extra={'handler': 'check_game_timeouts'})
+
+
+async def log_stats(context: ContextTypes.DEFAULT_TYPE):
+    """Пишет в лог счетчики защиты от флуда, кэшей и набора чатов с очками в памяти"""
+    for name, flood in (('отгадки', guess_flood), ('стать ведущим', host_flood)):
+        stats = flood.stats()
+        logger.info(
+            "Флуд (%s): пропущено %s, отброшено по лимиту игрока %s, по лимиту чата %s",
+            name, stats['allowed'], stats['dropped_user'], stats['dropped_chat']
+        )
+    
+    stats = leaderboard_cache.stats()
+    logger.info(
+        "Кэш таблиц лидеров: %s чатов, попаданий %s, промахов %s (%.0f%%)",
+        stats['size'], stats['hits'], stats['misses'], stats['hit_ratio'] * 100
+    )
+    
+    stats = admin_cache.stats()
+    logger.info(
+        "Кэш администраторов: %s чатов, попаданий %s, промахов %s",
+        stats['chats'], stats['hits'], stats['misses']
+    )
+    
+    stats = crocodile_game.get_cache_stats()
+    if stats is not None:
+        logger.info(
+            "Очки в памяти: %s чатов, %s записей; попаданий %s, промахов %s, вытеснений %s",
+            stats['resident_chats'], stats['resident_entries'],
+            stats['hits'], stats['misses'], stats['evictions']
+        )
 
 
 def main():
@@ -358,6 +688,9 @@ def main():
         logger.error("TELEGRAM_BOT_TOKEN не установлен! Создайте файл .env и добавьте токен.")
         return
     
+    # RUNTIME_PROFILE=performance: uvloop, пулы соединений и пороги GC под высокую нагрузку
+    profile = get_profile()
+    
     # Инициализация после запуска приложения
     async def post_init(app: Application) -> None:
         """Инициализация после запуска приложения"""
@@ -367,21 +700,35 @@ def main():
             interval=30,  # Проверяем каждые 30 секунд
             first=10  # Первая проверка через 10 секунд после запуска
         )
+        # Раз в 10 минут пишем в лог счетчики
+        app.job_queue.run_repeating(log_stats, interval=600, first=600)
         logger.info("Периодические задачи запущены")
+        
+        if profile == PERFORMANCE_PROFILE:
+            # Все, что создано при запуске, сборщику мусора больше не нужно обходить
+            freeze_gc()
     
     # Создаем приложение с post_init
     # job_queue создается автоматически при установленном пакете [job-queue]
-    application = Application.builder().token(token).post_init(post_init).build()
+    builder = apply_runtime_profile(Application.builder().token(token).post_init(post_init), profile)
+    application = builder.build()
     
     # Регистрируем обработчики
-    application.add_handler(CommandHandler("start", start))
-    application.add_handler(CommandHandler("stop", stop_game))
-    application.add_handler(CommandHandler("stats", show_stats))
-    application.add_handler(CallbackQueryHandler(choose_game, pattern='^choose_game$'))
-    application.add_handler(CallbackQueryHandler(start_crocodile, pattern='^game_crocodile$'))
-    application.add_handler(CallbackQueryHandler(become_host, pattern='^become_host$'))
-    application.add_handler(CallbackQueryHandler(show_word, pattern='^show_word$'))
-    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
+    # log_handler замеряет время выполнения каждого обработчика
+    application.add_handler(CommandHandler("start", log_handler(start)))
+    application.add_handler(CommandHandler("stop", log_handler(stop_game)))
+    application.add_handler(CommandHandler("stats", log_handler(show_stats)))
+    application.add_handler(CommandHandler("reset", log_handler(reset_stats)))
+    application.add_handler(CommandHandler("pack", log_handler(choose_pack)))
+    application.add_handler(CommandHandler("hint", log_handler(word_chain_hint)))
+    application.add_handler(CallbackQueryHandler(log_handler(choose_game), pattern='^choose_game$'))
+    application.add_handler(CallbackQueryHandler(log_handler(start_crocodile), pattern='^game_crocodile$'))
+    application.add_handler(CallbackQueryHandler(log_handler(start_word_chain), pattern='^game_word_chain$'))
+    application.add_handler(CallbackQueryHandler(log_handler(become_host), pattern='^become_host$'))
+    application.add_handler(CallbackQueryHandler(log_handler(show_word), pattern='^show_word$'))
+    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, log_handler(handle_message)))
+    # События chat_member приходят, только если бот - администратор чата
+    application.add_handler(ChatMemberHandler(log_handler(chat_member_update), ChatMemberHandler.ANY_CHAT_MEMBER))
     
     # Обработчик ошибок
     async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -395,16 +742,21 @@ def main():
         
         # Игнорируем сетевые ошибки (они обрабатываются автоматически)
         if isinstance(error, NetworkError):
-            logger.warning(f"Сетевая ошибка: {error}. Повторная попытка...")
+            logger.warning("Сетевая ошибка: %s. Повторная попытка...", error)
             return
         
         # Обрабатываем RateLimit
         if isinstance(error, RetryAfter):
-            logger.warning(f"Rate limit: {error.retry_after} секунд")
+            logger.warning("Rate limit: %s секунд", error.retry_after)
             return
         
         # Логируем остальные ошибки
-        logger.error(f"Ошибка при обработке обновления: {error}", exc_info=error)
+        chat = getattr(update, 'effective_chat', None)
+        user = getattr(update, 'effective_user', None)
+        logger.error(
+            "Ошибка при обработке обновления: %s", error, exc_info=error,
+            extra={'chat_id': chat.id if chat else None, 'user_id': user.id if user else None}
+        )
     
     # Регистрируем обработчик ошибок
     application.add_error_handler(error_handler)
@@ -421,7 +773,7 @@ def main():
     except KeyboardInterrupt:
         logger.info("Бот остановлен пользователем")
     except Exception as e:
-        logger.error(f"Критическая ошибка: {e}", exc_info=e)
+        logger.error("Критическая ошибка: %s", e, exc_info=e)
 
 
 if __name__ == '__main__':
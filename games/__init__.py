@@ -1,4 +1,5 @@
 from .crocodile import CrocodileGame
+from .word_chain import WordChainGame
 
-__all__ = ['CrocodileGame']
+__all__ = ['CrocodileGame', 'WordChainGame']
 
@@ -0,0 +1,154 @@
+"""
+Компактный бинарный формат статистики очков.
+
+Структура файла (little-endian):
+    заголовок:  magic b'CSCR', версия (u16), резерв (u16), число чатов (u32), число записей (u32)
+    индекс:     по одной записи на чат, отсортирован по chat_id:
+                chat_id (i64), номер первой записи (u32), число записей (u32)
+    записи:     chat_id (i64), user_id (i64), score (i32), сгруппированы по чатам
+
+Файл читается через mmap, поэтому очки одного чата можно получить
+бинарным поиском по индексу, не разбирая весь файл (load_chat - для
+инструментов и проверок). CrocodileGame загружает файл целиком через
+load_all и перезаписывает его при сохранении: формат ускоряет запуск,
+а чтение по чатам в игре дает режим scores.db (games/scores.py).
+
+Конвертация в scores.json и обратно - games/convert_scores.py.
+"""
+import os
+import json
+import mmap
+import struct
+from typing import Dict, Iterator, List, Optional
+
+MAGIC = b'CSCR'
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct('<4sHHII')
+INDEX_ENTRY = struct.Struct('<qII')
+RECORD = struct.Struct('<qqi')
+
+
+class BinaryScoreFile:
+    """Бинарный файл очков, открытый через mmap (только чтение)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path}: файл слишком короткий")
+
+        magic, version, _, self.chat_count, self.record_count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: не является файлом очков")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path}: неподдерживаемая версия формата {version}")
+
+        self._index_start = HEADER.size
+        self._records_start = self._index_start + self.chat_count * INDEX_ENTRY.size
+        expected_size = self._records_start + self.record_count * RECORD.size
+        if len(self._mmap) < expected_size:
+            self.close()
+            raise ValueError(f"{path}: файл обрезан")
+
+    def __len__(self) -> int:
+        return self.chat_count
+
+    def __enter__(self) -> 'BinaryScoreFile':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._mmap.close()
+
+    def _index_entry(self, position: int):
+        return INDEX_ENTRY.unpack_from(self._mmap, self._index_start + position * INDEX_ENTRY.size)
+
+    def _find(self, chat_id: int) -> Optional[int]:
+        """Бинарный поиск чата в индексе, возвращает позицию или None"""
+        low, high = 0, self.chat_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._index_entry(middle)[0] < chat_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.chat_count and self._index_entry(low)[0] == chat_id:
+            return low
+        return None
+
+    def _read_chat(self, first: int, count: int) -> Dict[int, int]:
+        start = self._records_start + first * RECORD.size
+        records = self._mmap[start:start + count * RECORD.size]
+        return {user_id: score for _, user_id, score in RECORD.iter_unpack(records)}
+
+    def chat_ids(self) -> Iterator[int]:
+        """Перебирает chat_id всех чатов в порядке возрастания"""
+        for position in range(self.chat_count):
+            yield self._index_entry(position)[0]
+
+    def load_chat(self, chat_id: int) -> Dict[int, int]:
+        """Возвращает очки одного чата (пустой словарь, если чата нет)"""
+        position = self._find(chat_id)
+        if position is None:
+            return {}
+        _, first, count = self._index_entry(position)
+        return self._read_chat(first, count)
+
+    def load_all(self) -> Dict[int, Dict[int, int]]:
+        """Возвращает очки всех чатов"""
+        index = self._mmap[self._index_start:self._records_start]
+        return {
+            chat_id: self._read_chat(first, count)
+            for chat_id, first, count in INDEX_ENTRY.iter_unpack(index)
+        }
+
+
+def write_binary_scores(path: str, scores: Dict[int, Dict[int, int]]):
+    """Записывает очки в бинарный файл (через временный файл, чтобы не оставить его обрезанным)"""
+    chat_ids = sorted(chat_id for chat_id, users in scores.items() if users)
+    index: List[bytes] = []
+    records: List[bytes] = []
+    record_count = 0
+
+    for chat_id in chat_ids:
+        users = scores[chat_id]
+        index.append(INDEX_ENTRY.pack(chat_id, record_count, len(users)))
+        for user_id, score in users.items():
+            records.append(RECORD.pack(chat_id, user_id, score))
+        record_count += len(users)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(chat_ids), record_count))
+        f.write(b''.join(index))
+        f.write(b''.join(records))
+    os.replace(tmp_path, path)
+
+
+def read_json_scores(path: str) -> Dict[int, Dict[int, int]]:
+    """Читает scores.json в формате CrocodileGame.save_scores"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {
+        int(chat_id): {int(user_id): score for user_id, score in users.items()}
+        for chat_id, users in data.items()
+    }
+
+
+def write_json_scores(path: str, scores: Dict[int, Dict[int, int]]):
+    """Записывает очки в scores.json в формате CrocodileGame.save_scores"""
+    data = {
+        str(chat_id): {str(user_id): score for user_id, score in users.items()}
+        for chat_id, users in scores.items()
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
@@ -0,0 +1,42 @@
+"""
+Сборка наборов слов из текстовых исходников в формат .pack.
+
+Запуск из корня проекта:
+    python -m games.build_word_packs packs/           # все packs/*.txt -> packs/*.pack
+    python -m games.build_word_packs packs/en.txt     # один набор
+"""
+import os
+import sys
+from typing import List
+
+from games.word_packs import PACK_EXTENSION, read_word_source, write_word_pack
+
+
+def build(source: str) -> str:
+    """Собирает один набор рядом с исходником и возвращает путь к .pack"""
+    title, words = read_word_source(source)
+    target = os.path.splitext(source)[0] + PACK_EXTENSION
+    name = os.path.splitext(os.path.basename(source))[0]
+    write_word_pack(target, words, title or name)
+    print(f"{source} -> {target}: {len(words)} слов")
+    return target
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) != 1:
+        print(__doc__)
+        return 2
+
+    path = argv[0]
+    if os.path.isdir(path):
+        sources = [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.txt')]
+    else:
+        sources = [path]
+
+    for source in sources:
+        build(source)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,33 @@
+"""
+Конвертация статистики очков между scores.json и бинарным форматом.
+
+Запуск из корня проекта:
+    python -m games.convert_scores to-bin scores.json scores.bin
+    python -m games.convert_scores to-json scores.bin scores.json
+"""
+import sys
+from typing import List
+
+from games.binary_scores import BinaryScoreFile, read_json_scores, write_binary_scores, write_json_scores
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) != 3 or argv[0] not in ('to-bin', 'to-json'):
+        print(__doc__)
+        return 2
+
+    command, source, target = argv
+    if command == 'to-bin':
+        scores = read_json_scores(source)
+        write_binary_scores(target, scores)
+    else:
+        with BinaryScoreFile(source) as score_file:
+            scores = score_file.load_all()
+        write_json_scores(target, scores)
+
+    print(f"{source} -> {target}: {len(scores)} чатов")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
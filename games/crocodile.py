@@ -2,19 +2,165 @@ import random
 import time
 import json
 import os
-from typing import Dict, Optional, Set, Tuple
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 from games.words import WORDS
+from games.text import normalize_text
+from games.word_packs import load_word_packs
+from games.scores import ResidentScores, SqliteScoreStore
+from games.binary_scores import BinaryScoreFile, write_binary_scores
+
+logger = logging.getLogger(__name__)
 
 
 class CrocodileGame:
     """Игра Крокодил - ведущий объясняет слово, остальные отгадывают"""
     
     SCORES_FILE = 'scores.json'
+    SCORES_DB = 'scores.db'
+    PACKS_FILE = 'chat_packs.json'
+    DEFAULT_PACK = 'default'
     
-    def __init__(self):
+    def __init__(self, scores_file: Optional[str] = None, autosave: bool = True,
+                 max_resident_chats: int = 0, max_resident_entries: int = 0, scores_db: Optional[str] = None,
+                 word_packs_dir: Optional[str] = None, packs_file: Optional[str] = None):
+        if scores_file is not None:
+            self.SCORES_FILE = scores_file
+        if scores_db is not None:
+            self.SCORES_DB = scores_db
+        if packs_file is not None:
+            self.PACKS_FILE = packs_file
+        self.autosave = autosave  # Сохранять файл после каждого изменения очков
         self.active_games: Dict[int, Dict] = {}  # chat_id -> game_state
         self.scores: Dict[int, Dict[int, int]] = {}  # chat_id -> {user_id -> score}
-        self.load_scores()
+        self.score_versions: Dict[int, int] = {}  # chat_id -> номер изменения очков
+        # Ограниченный набор чатов в памяти поверх SQLite (None - все очки в self.scores)
+        self.resident: Optional[ResidentScores] = None
+        # Наборы слов: name -> последовательность слов (WORDS и внешние .pack через mmap)
+        self.word_packs: Dict[str, Sequence[str]] = {self.DEFAULT_PACK: WORDS}
+        self.chat_packs: Dict[int, str] = {}  # chat_id -> имя набора, если он не default
+        
+        if word_packs_dir is not None:
+            self.load_word_packs(word_packs_dir)
+        self.load_chat_packs()
+        
+        if max_resident_chats > 0 or max_resident_entries > 0:
+            self._init_resident(max_resident_chats, max_resident_entries)
+        else:
+            self.load_scores()
+            self._export_resident()
+    
+    def _scores_file_stamp(self) -> str:
+        """Время изменения и размер SCORES_FILE (пустая строка, если файла нет)"""
+        if not os.path.exists(self.SCORES_FILE):
+            return ''
+        stat = os.stat(self.SCORES_FILE)
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+    
+    def _init_resident(self, max_chats: int, max_entries: int):
+        """
+        Включает режим с вытеснением редко используемых чатов в scores.db.
+        
+        В meta хранится отметка SCORES_FILE (время изменения и размер) на момент
+        последней синхронизации. Если файл с тех пор изменился (бот работал без
+        ограничения памяти), база заменяется его содержимым.
+        """
+        store = SqliteScoreStore(self.SCORES_DB)
+        
+        stamp = self._scores_file_stamp()
+        if store.get_meta('scores_file_stamp') != stamp:
+            if stamp:
+                self.load_scores()
+                store.replace_scores(self.scores)
+                logger.info("Статистика %s перенесена в %s: %s чатов", self.SCORES_FILE, self.SCORES_DB, len(self.scores))
+                self.scores = {}
+            store.set_meta('scores_file_stamp', stamp)
+        
+        self.resident = ResidentScores(store, max_chats=max_chats, max_entries=max_entries, autosave=self.autosave)
+    
+    def _export_resident(self):
+        """
+        Переносит очки из scores.db в SCORES_FILE при запуске без ограничения памяти.
+        
+        База считается актуальной, если SCORES_FILE не менялся после последней
+        синхронизации: значит, очки с тех пор начислялись только в scores.db.
+        """
+        if not os.path.exists(self.SCORES_DB):
+            return
+        
+        store = SqliteScoreStore(self.SCORES_DB)
+        try:
+            synced = store.get_meta('scores_file_stamp')
+            if synced is None or synced != self._scores_file_stamp():
+                return
+            self.scores = store.load_all()
+            self.save_scores()
+            store.set_meta('scores_file_stamp', self._scores_file_stamp())
+            logger.info("Статистика %s перенесена в %s: %s чатов", self.SCORES_DB, self.SCORES_FILE, len(self.scores))
+        finally:
+            store.close()
+    
+    def load_word_packs(self, directory: str):
+        """Подключает наборы слов .pack из папки"""
+        try:
+            packs = load_word_packs(directory)
+        except Exception as e:
+            logger.error("Ошибка при загрузке наборов слов из %s: %s", directory, e)
+            return
+        
+        for name, pack in packs.items():
+            if name == self.DEFAULT_PACK:
+                logger.warning("Набор %s пропущен: имя занято встроенным набором", pack.path)
+                continue
+            self.word_packs[name] = pack
+        logger.info("Загружено наборов слов: %s", len(packs))
+    
+    def get_word_pack_info(self) -> List[Tuple[str, str, int]]:
+        """Возвращает доступные наборы слов: [(имя, название, количество слов), ...]"""
+        return [
+            (name, getattr(pack, 'title', None) or 'Стандартный', len(pack))
+            for name, pack in self.word_packs.items()
+        ]
+    
+    def get_word_pack(self, chat_id: int) -> str:
+        """Возвращает имя набора слов, выбранного в чате (default, если набор больше не доступен)"""
+        name = self.chat_packs.get(chat_id, self.DEFAULT_PACK)
+        return name if name in self.word_packs else self.DEFAULT_PACK
+    
+    def set_word_pack(self, chat_id: int, name: str) -> bool:
+        """Выбирает набор слов для чата, возвращает False, если набора нет"""
+        if name not in self.word_packs:
+            return False
+        if name == self.DEFAULT_PACK:
+            self.chat_packs.pop(chat_id, None)
+        else:
+            self.chat_packs[chat_id] = name
+        self.save_chat_packs()
+        return True
+    
+    def save_chat_packs(self):
+        """Сохраняет выбранные в чатах наборы слов в файл"""
+        try:
+            with open(self.PACKS_FILE, 'w', encoding='utf-8') as f:
+                json.dump({str(chat_id): name for chat_id, name in self.chat_packs.items()}, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            logger.error("Ошибка при сохранении наборов слов чатов: %s", e)
+    
+    def load_chat_packs(self):
+        """
+        Загружает выбранные в чатах наборы слов из файла. Выбор набора,
+        которого сейчас нет в папке, сохраняется: пока набор не вернется,
+        в чате используется default.
+        """
+        if not os.path.exists(self.PACKS_FILE):
+            return
+        
+        try:
+            with open(self.PACKS_FILE, 'r', encoding='utf-8') as f:
+                self.chat_packs = {int(chat_id): name for chat_id, name in json.load(f).items()}
+        except Exception as e:
+            logger.error("Ошибка при загрузке наборов слов чатов: %s", e)
+            self.chat_packs = {}
     
     def start_game(self, chat_id: int) -> bool:
         """Начинает новую игру в чате"""
@@ -42,17 +188,14 @@ class CrocodileGame:
     
     def _normalize_word(self, word: str) -> str:
         """Нормализует слово для сравнения - убирает знаки препинания, делает lowercase"""
-        import re
-        # Приводим к нижнему регистру, убираем знаки препинания и лишние пробелы
-        normalized = re.sub(r'[^\w\s]', '', word.lower())
-        return ' '.join(normalized.split())  # Убираем лишние пробелы
+        return normalize_text(word)
     
     def set_host(self, chat_id: int, user_id: int) -> Optional[str]:
         """Устанавливает ведущего и дает ему новое слово"""
         if not self.is_game_active(chat_id):
             return None
         
-        word = random.choice(WORDS)
+        word = random.choice(self.word_packs[self.get_word_pack(chat_id)])
         self.active_games[chat_id]['host_user_id'] = user_id
         self.active_games[chat_id]['current_word'] = word
         self.active_games[chat_id]['word_lower'] = self._normalize_word(word)
@@ -104,6 +247,33 @@ class CrocodileGame:
         
         return False, False
     
+    def check_guesses(self, chat_id: int, guesses: Iterable[Tuple[int, str, int]]) -> Optional[Tuple[int, int]]:
+        """
+        Проверяет пачку отгадок из одного чата за один проход
+        guesses: [(user_id, text, message_id), ...]
+        Returns: (user_id, message_id) первой правильной отгадки по порядку сообщений или None
+        """
+        game = self.active_games.get(chat_id)
+        if game is None or game['guessed']:
+            return None
+        
+        host_id = game['host_user_id']
+        word_normalized = game['word_lower']
+        # Длина нормализованной отгадки не больше длины текста, поэтому
+        # заведомо короткие сообщения можно не нормализовать
+        min_length = len(word_normalized) if word_normalized else 0
+        
+        for user_id, text, message_id in sorted(guesses, key=lambda g: g[2]):
+            if user_id == host_id or len(text) < min_length:
+                continue
+            if self._normalize_word(text) == word_normalized:
+                game['guessed'] = True
+                game['guesser_user_id'] = user_id
+                self.add_score(chat_id, user_id, 1)
+                return user_id, message_id
+        
+        return None
+    
     def is_guessed(self, chat_id: int) -> bool:
         """Проверяет, отгадано ли слово"""
         if not self.is_game_active(chat_id):
@@ -156,34 +326,67 @@ class CrocodileGame:
         remaining = game['timeout_seconds'] - elapsed
         return max(0, int(remaining))
     
+    def _bump_score_version(self, chat_id: int):
+        """Отмечает изменение очков в чате"""
+        self.score_versions[chat_id] = self.score_versions.get(chat_id, 0) + 1
+    
+    def get_score_version(self, chat_id: int) -> int:
+        """Возвращает номер изменения очков в чате (меняется при каждом add_score/reset_scores)"""
+        return self.score_versions.get(chat_id, 0)
+    
     def add_score(self, chat_id: int, user_id: int, points: int = 1):
         """Начисляет очки игроку"""
+        self._bump_score_version(chat_id)
+        if self.resident is not None:
+            self.resident.add(chat_id, user_id, points)
+            return
         if chat_id not in self.scores:
             self.scores[chat_id] = {}
         if user_id not in self.scores[chat_id]:
             self.scores[chat_id][user_id] = 0
         self.scores[chat_id][user_id] += points
-        self.save_scores()
+        if self.autosave:
+            self.save_scores()
     
     def get_score(self, chat_id: int, user_id: int) -> int:
         """Возвращает количество очков игрока в чате"""
+        if self.resident is not None:
+            return self.resident.get(chat_id).get(user_id, 0)
         if chat_id not in self.scores:
             return 0
         return self.scores[chat_id].get(user_id, 0)
     
     def get_all_scores(self, chat_id: int) -> Dict[int, int]:
         """Возвращает все очки в чате"""
+        if self.resident is not None:
+            return self.resident.get(chat_id).copy()
         return self.scores.get(chat_id, {}).copy()
     
     def reset_scores(self, chat_id: int):
         """Сбрасывает все очки в чате"""
+        self._bump_score_version(chat_id)
+        if self.resident is not None:
+            self.resident.delete(chat_id)
+            return
         if chat_id in self.scores:
             del self.scores[chat_id]
-            self.save_scores()
+            if self.autosave:
+                self.save_scores()
+    
+    def _is_binary_file(self) -> bool:
+        """Файл статистики с расширением .bin хранится в бинарном формате (games/binary_scores.py)"""
+        return self.SCORES_FILE.endswith('.bin')
     
     def save_scores(self):
         """Сохраняет статистику очков в файл"""
+        if self.resident is not None:
+            self.resident.flush()
+            return
         try:
+            if self._is_binary_file():
+                write_binary_scores(self.SCORES_FILE, self.scores)
+                return
+            
             # Конвертируем ключи в строки для JSON
             scores_to_save = {}
             for chat_id, users in self.scores.items():
@@ -193,7 +396,7 @@ class CrocodileGame:
                 json.dump(scores_to_save, f, ensure_ascii=False, indent=2)
         except Exception as e:
             # Логируем ошибку, но не падаем
-            print(f"Ошибка при сохранении статистики: {e}")
+            logger.error("Ошибка при сохранении статистики: %s", e)
     
     def load_scores(self):
         """Загружает статистику очков из файла"""
@@ -201,6 +404,11 @@ class CrocodileGame:
             return
         
         try:
+            if self._is_binary_file():
+                with BinaryScoreFile(self.SCORES_FILE) as score_file:
+                    self.scores = score_file.load_all()
+                return
+            
             with open(self.SCORES_FILE, 'r', encoding='utf-8') as f:
                 scores_data = json.load(f)
             
@@ -211,6 +419,11 @@ class CrocodileGame:
                 self.scores[chat_id] = {int(user_id_str): score for user_id_str, score in users.items()}
         except Exception as e:
             # Если файл поврежден, начинаем с пустой статистики
-            print(f"Ошибка при загрузке статистики: {e}")
+            logger.error("Ошибка при загрузке статистики: %s", e)
             self.scores = {}
-
+    
+    def get_cache_stats(self) -> Optional[Dict[str, int]]:
+        """Возвращает счетчики набора чатов в памяти (None, если вытеснение выключено)"""
+        if self.resident is None:
+            return None
+        return self.resident.stats()
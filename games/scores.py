@@ -0,0 +1,191 @@
+import sqlite3
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+
+
+class SqliteScoreStore:
+    """Хранилище очков в SQLite - позволяет читать и писать очки одного чата"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS scores ('
+            'chat_id INTEGER NOT NULL, user_id INTEGER NOT NULL, score INTEGER NOT NULL, '
+            'PRIMARY KEY (chat_id, user_id)) WITHOUT ROWID'
+        )
+        self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+        self.conn.commit()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Возвращает служебное значение (например, отметку о переносе из scores.json)"""
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        """Сохраняет служебное значение"""
+        self.conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+        self.conn.commit()
+
+    def is_empty(self) -> bool:
+        """Проверяет, есть ли в хранилище хотя бы одна запись"""
+        return self.conn.execute('SELECT 1 FROM scores LIMIT 1').fetchone() is None
+
+    def load_chat(self, chat_id: int) -> Dict[int, int]:
+        """Возвращает очки чата (пустой словарь, если чата нет)"""
+        rows = self.conn.execute('SELECT user_id, score FROM scores WHERE chat_id = ?', (chat_id,))
+        return dict(rows)
+
+    def save_score(self, chat_id: int, user_id: int, score: int):
+        """Сохраняет очки одного игрока"""
+        self.conn.execute(
+            'INSERT OR REPLACE INTO scores (chat_id, user_id, score) VALUES (?, ?, ?)',
+            (chat_id, user_id, score)
+        )
+        self.conn.commit()
+
+    def save_chat(self, chat_id: int, users: Dict[int, int]):
+        """Сохраняет очки всех игроков чата"""
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO scores (chat_id, user_id, score) VALUES (?, ?, ?)',
+            ((chat_id, user_id, score) for user_id, score in users.items())
+        )
+        self.conn.commit()
+
+    def delete_chat(self, chat_id: int):
+        """Удаляет все очки чата"""
+        self.conn.execute('DELETE FROM scores WHERE chat_id = ?', (chat_id,))
+        self.conn.commit()
+
+    def import_scores(self, scores: Dict[int, Dict[int, int]]):
+        """Импортирует очки всех чатов (например, из scores.json)"""
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO scores (chat_id, user_id, score) VALUES (?, ?, ?)',
+            (
+                (chat_id, user_id, score)
+                for chat_id, users in scores.items()
+                for user_id, score in users.items()
+            )
+        )
+        self.conn.commit()
+
+    def replace_scores(self, scores: Dict[int, Dict[int, int]]):
+        """Заменяет все очки в хранилище (например, очками из scores.json)"""
+        self.conn.execute('DELETE FROM scores')
+        self.import_scores(scores)
+
+    def load_all(self) -> Dict[int, Dict[int, int]]:
+        """Возвращает очки всех чатов"""
+        scores: Dict[int, Dict[int, int]] = {}
+        for chat_id, user_id, score in self.conn.execute('SELECT chat_id, user_id, score FROM scores'):
+            scores.setdefault(chat_id, {})[user_id] = score
+        return scores
+
+    def close(self):
+        self.conn.close()
+
+
+class ResidentScores:
+    """
+    Ограниченный набор чатов с очками в памяти поверх хранилища.
+
+    Чаты, к которым давно не обращались, вытесняются в хранилище (LRU)
+    и загружаются обратно при следующем обращении. Бюджет задается
+    количеством чатов (max_chats) и/или общим количеством записей
+    "игрок - очки" (max_entries), 0 - без ограничения.
+    """
+
+    def __init__(self, store: SqliteScoreStore, max_chats: int = 0, max_entries: int = 0, autosave: bool = True):
+        self.store = store
+        self.max_chats = max_chats
+        self.max_entries = max_entries
+        self.autosave = autosave  # Писать каждое изменение сразу, иначе - при вытеснении и flush()
+        self.chats: 'OrderedDict[int, Dict[int, int]]' = OrderedDict()  # chat_id -> {user_id -> score}
+        self.dirty: Set[int] = set()  # Чаты с несохраненными изменениями
+        self.entries = 0  # Количество записей во всех чатах в памяти
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, chat_id: int) -> Dict[int, int]:
+        """Возвращает очки чата, загружая их из хранилища при необходимости"""
+        users = self.chats.get(chat_id)
+        if users is not None:
+            self.hits += 1
+            self.chats.move_to_end(chat_id)
+            return users
+
+        self.misses += 1
+        users = self.store.load_chat(chat_id)
+        if not users:
+            # Чат без очков не занимает место в наборе - он добавится с первым очком
+            return users
+        self.chats[chat_id] = users
+        self.entries += len(users)
+        self._evict(keep=chat_id)
+        return users
+
+    def add(self, chat_id: int, user_id: int, points: int) -> int:
+        """Начисляет очки игроку и возвращает новое значение"""
+        users = self.get(chat_id)
+        if chat_id not in self.chats:
+            self.chats[chat_id] = users
+        if user_id not in users:
+            users[user_id] = 0
+            self.entries += 1
+        users[user_id] += points
+
+        if self.autosave:
+            self.store.save_score(chat_id, user_id, users[user_id])
+        else:
+            self.dirty.add(chat_id)
+
+        self._evict(keep=chat_id)
+        return users[user_id]
+
+    def delete(self, chat_id: int):
+        """Удаляет очки чата из памяти и хранилища"""
+        users = self.chats.pop(chat_id, None)
+        if users is not None:
+            self.entries -= len(users)
+        self.dirty.discard(chat_id)
+        self.store.delete_chat(chat_id)
+
+    def flush(self):
+        """Сохраняет все несохраненные изменения в хранилище"""
+        for chat_id in self.dirty:
+            users = self.chats.get(chat_id)
+            if users:
+                self.store.save_chat(chat_id, users)
+        self.dirty.clear()
+
+    def _over_budget(self) -> bool:
+        if self.max_chats and len(self.chats) > self.max_chats:
+            return True
+        return bool(self.max_entries) and self.entries > self.max_entries
+
+    def _evict(self, keep: Optional[int] = None):
+        """Вытесняет самые старые чаты, пока набор не уложится в бюджет"""
+        while self._over_budget() and len(self.chats) > 1:
+            chat_id, users = self.chats.popitem(last=False)
+            if chat_id == keep:
+                # Текущий чат не вытесняем, даже если он один больше бюджета
+                self.chats[chat_id] = users
+                continue
+            if chat_id in self.dirty:
+                self.store.save_chat(chat_id, users)
+                self.dirty.discard(chat_id)
+            self.entries -= len(users)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает счетчики попаданий, промахов и вытеснений"""
+        return {
+            'resident_chats': len(self.chats),
+            'resident_entries': self.entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
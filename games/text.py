@@ -0,0 +1,15 @@
+import re
+
+# Все, кроме букв, цифр и пробелов (скомпилировано один раз, а не на каждое сообщение)
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+
+def normalize_text(text: str, fold_yo: bool = False) -> str:
+    """
+    Нормализует слово для сравнения: lowercase, без знаков препинания
+    и лишних пробелов. fold_yo=True дополнительно заменяет ё на е.
+    """
+    text = text.lower()
+    if fold_yo:
+        text = text.replace('ё', 'е')
+    return ' '.join(_PUNCTUATION_RE.sub('', text).split())
@@ -0,0 +1,240 @@
+import time
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from games.words import WORDS
+from games.text import normalize_text
+
+# Буквы, с которых слово начинаться не может - при выборе следующей буквы они пропускаются
+SKIPPED_LAST_LETTERS = 'ьъы'
+
+
+def normalize_word(word: str) -> str:
+    """Нормализует слово: lowercase, ё -> е, без знаков препинания и лишних пробелов"""
+    return normalize_text(word, fold_yo=True)
+
+
+def last_letter(word: str) -> Optional[str]:
+    """Возвращает букву, на которую должно начинаться следующее слово"""
+    for char in reversed(word):
+        if char.isalpha() and char not in SKIPPED_LAST_LETTERS:
+            return char
+    return None
+
+
+class WordIndex:
+    """
+    Сжатый префиксный индекс слов (DAWG - граф, в котором общие
+    окончания слов хранятся один раз).
+
+    Проверка слова - O(длины слова), количество слов на букву - O(1).
+    """
+
+    def __init__(self, words: Iterable[str]):
+        normalized = sorted({word for word in map(normalize_word, words) if word})
+        self.size = len(normalized)
+        # Сколько слов начинается с каждой буквы
+        self.first_letter_counts: Dict[str, int] = {}
+        for word in normalized:
+            self.first_letter_counts[word[0]] = self.first_letter_counts.get(word[0], 0) + 1
+
+        self._edges: List[Dict[str, int]] = []  # node -> {char -> node}
+        self._final: List[bool] = []  # node -> заканчивается ли здесь слово
+        self._build(normalized)
+
+    def _new_node(self) -> int:
+        self._edges.append({})
+        self._final.append(False)
+        return len(self._edges) - 1
+
+    def _build(self, sorted_words: List[str]):
+        """Строит минимальный граф по отсортированным словам (алгоритм Дацюка)"""
+        root = self._new_node()
+        register: Dict[Tuple, int] = {}  # описание узла -> узел с таким же поддеревом
+        unchecked: List[Tuple[int, str, int]] = []  # (родитель, буква, узел) еще не объединенные узлы
+        previous = ''
+
+        def minimize(down_to: int):
+            while len(unchecked) > down_to:
+                parent, char, child = unchecked.pop()
+                key = (self._final[child], tuple(sorted(self._edges[child].items())))
+                if key in register:
+                    self._edges[parent][char] = register[key]
+                else:
+                    register[key] = child
+
+        for word in sorted_words:
+            common = 0
+            for a, b in zip(word, previous):
+                if a != b:
+                    break
+                common += 1
+
+            minimize(common)
+            node = unchecked[-1][2] if unchecked else root
+            for char in word[common:]:
+                child = self._new_node()
+                self._edges[node][char] = child
+                unchecked.append((node, char, child))
+                node = child
+            self._final[node] = True
+            previous = word
+
+        minimize(0)
+        self._compact(root)
+
+    def _compact(self, root: int):
+        """Удаляет узлы, замененные при минимизации, и перенумеровывает оставшиеся"""
+        order = {root: 0}
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            for child in self._edges[node].values():
+                if child not in order:
+                    order[child] = len(order)
+                    queue.append(child)
+
+        edges: List[Dict[str, int]] = [{}] * len(order)
+        final = [False] * len(order)
+        for old, new in order.items():
+            edges[new] = {char: order[child] for char, child in self._edges[old].items()}
+            final[new] = self._final[old]
+        self._edges = edges
+        self._final = final
+
+    @property
+    def node_count(self) -> int:
+        return len(self._edges)
+
+    def _walk(self, prefix: str) -> Optional[int]:
+        node = 0
+        for char in prefix:
+            node = self._edges[node].get(char)
+            if node is None:
+                return None
+        return node
+
+    def __contains__(self, word: str) -> bool:
+        """Проверяет нормализованное слово"""
+        node = self._walk(word)
+        return node is not None and self._final[node]
+
+    def count_starting_with(self, letter: str) -> int:
+        """Количество слов на букву"""
+        return self.first_letter_counts.get(letter, 0)
+
+    def iter_prefix(self, prefix: str) -> Iterator[str]:
+        """Перебирает слова с префиксом в алфавитном порядке"""
+        node = self._walk(prefix)
+        if node is None:
+            return
+        stack = [(node, prefix)]
+        while stack:
+            node, word = stack.pop()
+            if self._final[node]:
+                yield word
+            for char, child in sorted(self._edges[node].items(), reverse=True):
+                stack.append((child, word + char))
+
+
+class WordChainGame:
+    """Игра Слова - каждое следующее слово начинается на последнюю букву предыдущего"""
+
+    # Результаты хода
+    OK = 'ok'
+    NOT_A_WORD = 'not_a_word'
+    ALREADY_USED = 'already_used'
+    WRONG_LETTER = 'wrong_letter'
+    SAME_PLAYER = 'same_player'
+
+    def __init__(self, words: Iterable[str] = WORDS):
+        # Индекс общий для всех чатов, в чатах хранятся только использованные слова
+        self.index = WordIndex(words)
+        self.active_games: Dict[int, Dict] = {}  # chat_id -> game_state
+
+    def start_game(self, chat_id: int) -> bool:
+        """Начинает новую игру в чате"""
+        if chat_id in self.active_games:
+            return False  # Игра уже активна
+        self.active_games[chat_id] = {
+            'used': set(),  # Нормализованные слова, уже названные в чате
+            'used_by_letter': {},  # буква -> сколько слов на нее уже названо
+            'last_letter': None,
+            'last_user_id': None,
+            'moves': 0,
+            'last_move_time': time.time(),  # Начало игры или последний принятый ход
+            'timeout_seconds': 600  # 10 минут без ходов - игра завершается
+        }
+        return True
+
+    def stop_game(self, chat_id: int):
+        """Останавливает игру в чате"""
+        if chat_id in self.active_games:
+            del self.active_games[chat_id]
+
+    def is_game_active(self, chat_id: int) -> bool:
+        """Проверяет, активна ли игра в чате"""
+        return chat_id in self.active_games
+
+    def get_last_letter(self, chat_id: int) -> Optional[str]:
+        """Возвращает букву, на которую должно начинаться следующее слово"""
+        if not self.is_game_active(chat_id):
+            return None
+        return self.active_games[chat_id]['last_letter']
+
+    def check_timeout(self, chat_id: int) -> bool:
+        """Проверяет, истекло ли время ожидания следующего слова (10 минут)"""
+        game = self.active_games.get(chat_id)
+        if game is None:
+            return False
+        return time.time() - game['last_move_time'] >= game['timeout_seconds']
+
+    def get_moves(self, chat_id: int) -> int:
+        """Возвращает количество названных слов"""
+        if not self.is_game_active(chat_id):
+            return 0
+        return self.active_games[chat_id]['moves']
+
+    def remaining(self, chat_id: int, letter: str) -> int:
+        """Количество еще не названных в чате слов на букву - O(1)"""
+        game = self.active_games.get(chat_id)
+        used = game['used_by_letter'].get(letter, 0) if game else 0
+        return self.index.count_starting_with(letter) - used
+
+    def play_word(self, chat_id: int, user_id: int, text: str) -> Tuple[str, Optional[str]]:
+        """
+        Проверяет ход игрока
+        Returns: (результат, буква для следующего слова)
+        """
+        game = self.active_games.get(chat_id)
+        if game is None:
+            return self.NOT_A_WORD, None
+
+        word = normalize_word(text)
+        if word not in self.index:
+            return self.NOT_A_WORD, game['last_letter']
+        if game['last_letter'] is not None and word[0] != game['last_letter']:
+            return self.WRONG_LETTER, game['last_letter']
+        if game['last_user_id'] == user_id:
+            return self.SAME_PLAYER, game['last_letter']
+        if word in game['used']:
+            return self.ALREADY_USED, game['last_letter']
+
+        game['used'].add(word)
+        game['used_by_letter'][word[0]] = game['used_by_letter'].get(word[0], 0) + 1
+        game['last_letter'] = last_letter(word)
+        game['last_user_id'] = user_id
+        game['moves'] += 1
+        game['last_move_time'] = time.time()
+        return self.OK, game['last_letter']
+
+    def hint(self, chat_id: int) -> Optional[str]:
+        """Возвращает еще не названное слово на нужную букву"""
+        game = self.active_games.get(chat_id)
+        if game is None or game['last_letter'] is None:
+            return None
+        if self.remaining(chat_id, game['last_letter']) <= 0:
+            return None
+        for word in self.index.iter_prefix(game['last_letter']):
+            if word not in game['used']:
+                return word
+        return None
@@ -0,0 +1,142 @@
+"""
+Внешние наборы слов в формате с таблицей смещений, читаемом через mmap.
+
+Исходник набора - текстовый файл UTF-8, по одному слову в строке.
+Пустые строки и строки, начинающиеся с '#', пропускаются, строка
+'# title: Название' задает название набора.
+
+Структура собранного файла .pack (little-endian):
+    заголовок:  magic b'WPAK', версия (u16), длина названия (u16), число слов (u32)
+    название:   UTF-8
+    смещения:   число слов + 1 значений u32 - начало каждого слова в блоке слов
+    слова:      UTF-8 без разделителей
+
+Слово читается по индексу напрямую из mmap, поэтому открытие набора
+из сотен тысяч слов не требует ни разбора файла, ни памяти под список строк.
+
+Сборка - games/build_word_packs.py.
+"""
+import os
+import mmap
+import struct
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'WPAK'
+FORMAT_VERSION = 1
+PACK_EXTENSION = '.pack'
+
+HEADER = struct.Struct('<4sHHI')
+OFFSET = struct.Struct('<I')
+
+
+class MappedWordPack:
+    """Набор слов из файла .pack - последовательность строк, читаемая через mmap"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path}: файл слишком короткий")
+
+        magic, version, title_length, self._count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: не является набором слов")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path}: неподдерживаемая версия формата {version}")
+
+        title_start = HEADER.size
+        try:
+            self.title = self._mmap[title_start:title_start + title_length].decode('utf-8')
+        except UnicodeDecodeError:
+            self.close()
+            raise ValueError(f"{path}: название набора не в UTF-8")
+        self._offsets_start = title_start + title_length
+        self._words_start = self._offsets_start + (self._count + 1) * OFFSET.size
+        if len(self._mmap) < self._words_start or len(self._mmap) < self._words_start + self._offset(self._count):
+            self.close()
+            raise ValueError(f"{path}: файл обрезан")
+
+    def _offset(self, index: int) -> int:
+        return OFFSET.unpack_from(self._mmap, self._offsets_start + index * OFFSET.size)[0]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('word pack index out of range')
+        start = self._words_start + self._offset(index)
+        end = self._words_start + self._offset(index + 1)
+        return self._mmap[start:end].decode('utf-8')
+
+    def close(self):
+        self._mmap.close()
+
+
+def read_word_source(path: str) -> Tuple[Optional[str], List[str]]:
+    """Читает исходник набора, возвращает (название, слова) без повторов"""
+    title = None
+    words: Dict[str, None] = {}  # dict сохраняет порядок и убирает повторы
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('#'):
+                if line[1:].strip().lower().startswith('title:'):
+                    title = line.split(':', 1)[1].strip()
+                continue
+            words[line] = None
+    return title, list(words)
+
+
+def write_word_pack(path: str, words: Iterable[str], title: str = ''):
+    """Собирает файл .pack (через временный файл, чтобы не оставить его обрезанным)"""
+    encoded = [word.encode('utf-8') for word in words]
+    title_bytes = title.encode('utf-8')
+
+    offsets = [0]
+    for word in encoded:
+        offsets.append(offsets[-1] + len(word))
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(title_bytes), len(encoded)))
+        f.write(title_bytes)
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        f.write(b''.join(encoded))
+    os.replace(tmp_path, path)
+
+
+def load_word_packs(directory: str) -> Dict[str, MappedWordPack]:
+    """
+    Открывает все наборы .pack из папки, имя набора - имя файла без расширения.
+    Поврежденный файл пропускается, остальные наборы загружаются.
+    """
+    packs = {}
+    if not os.path.isdir(directory):
+        return packs
+
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(PACK_EXTENSION):
+            continue
+        try:
+            pack = MappedWordPack(os.path.join(directory, filename))
+        except (OSError, ValueError) as e:
+            logger.error("Набор слов %s пропущен: %s", filename, e)
+            continue
+        if len(pack) == 0:
+            pack.close()
+            continue
+        packs[filename[:-len(PACK_EXTENSION)]] = pack
+    return packs
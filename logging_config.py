@@ -0,0 +1,200 @@
+import os
+import copy
+import json
+import time
+import queue
+import atexit
+import logging
+import functools
+import logging.handlers
+from typing import Dict, Optional, Tuple
+
+# Поля, которые обработчики передают через extra= и которые попадают в JSON
+STRUCTURED_FIELDS = ('chat_id', 'user_id', 'handler', 'latency_ms', 'suppressed')
+
+logger = logging.getLogger(__name__)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Форматирует запись лога в одну строку JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'ts': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exc'] = record.exc_text
+
+        return json.dumps(data, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Текстовый формат с добавлением структурированных полей в конец строки"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields = [
+            f"{field}={getattr(record, field)}"
+            for field in STRUCTURED_FIELDS
+            if getattr(record, field, None) is not None
+        ]
+        if fields:
+            text += ' [' + ' '.join(fields) + ']'
+        return text
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Ограничивает частоту повторяющихся предупреждений.
+
+    Записи группируются по (логгер, шаблон сообщения), поэтому все
+    "Не удалось получить информацию о пользователе %s" считаются одной группой.
+    За interval секунд пропускается не больше burst записей группы, количество
+    отброшенных добавляется в поле suppressed следующей пропущенной записи.
+    Ошибки (ERROR и выше) не отбрасываются никогда.
+    """
+
+    def __init__(self, interval: float = 60.0, burst: int = 5):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self._windows: Dict[Tuple[str, str], list] = {}  # key -> [window_start, passed, suppressed]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.WARNING or self.burst <= 0:
+            return True
+
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        window = self._windows.get(key)
+
+        if window is None or now - window[0] >= self.interval:
+            suppressed = window[2] if window is not None else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.suppressed = suppressed
+            return True
+
+        if window[1] < self.burst:
+            window[1] += 1
+            return True
+
+        window[2] += 1
+        return False
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler, который оставляет форматирование потоку записи.
+
+    Стандартный prepare() вызывает format() в потоке event loop, здесь же
+    в потоке обработчика только подставляются аргументы сообщения.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(level: Optional[str] = None, fmt: Optional[str] = None) -> logging.handlers.QueueListener:
+    """
+    Настраивает неблокирующее логирование.
+
+    Обработчики кладут записи в очередь, а запись в stderr выполняет
+    фоновый поток QueueListener. Параметры берутся из переменных окружения:
+    LOG_LEVEL (INFO), LOG_FORMAT (json или text), LOG_SAMPLE_INTERVAL (60)
+    и LOG_SAMPLE_BURST (5).
+    """
+    global _listener
+
+    if _listener is not None:
+        return _listener
+
+    level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+    fmt = (fmt or os.getenv('LOG_FORMAT', 'json')).lower()
+    interval = float(os.getenv('LOG_SAMPLE_INTERVAL', '60'))
+    burst = int(os.getenv('LOG_SAMPLE_BURST', '5'))
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(interval=interval, burst=burst))
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(level)
+
+    # httpx пишет каждый запрос к Bot API на уровне INFO
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """Останавливает фоновый поток и дописывает оставшиеся записи"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def log_handler(func):
+    """
+    Декоратор для обработчиков Telegram: замеряет время выполнения
+    и пишет его в лог вместе с chat_id, user_id и именем обработчика.
+
+    Медленные обработчики (дольше LOG_SLOW_HANDLER_MS, по умолчанию 1000 мс)
+    логируются как предупреждение, остальные - на уровне DEBUG.
+    """
+    name = func.__name__
+    slow_ms = float(os.getenv('LOG_SLOW_HANDLER_MS', '1000'))
+
+    @functools.wraps(func)
+    async def wrapper(update, context):
+        start = time.perf_counter()
+        try:
+            return await func(update, context)
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            level = logging.WARNING if latency_ms >= slow_ms else logging.DEBUG
+            if logger.isEnabledFor(level):
+                chat = getattr(update, 'effective_chat', None)
+                user = getattr(update, 'effective_user', None)
+                logger.log(
+                    level,
+                    "Обработчик %s выполнен за %.1f мс", name, latency_ms,
+                    extra={
+                        'handler': name,
+                        'chat_id': chat.id if chat else None,
+                        'user_id': user.id if user else None,
+                        'latency_ms': round(latency_ms, 2),
+                    }
+                )
+
+    return wrapper
@@ -0,0 +1,94 @@
+import time
+from typing import Dict, Hashable, List, Optional
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket по ключу: не больше rate событий в секунду
+    с допустимым всплеском до burst событий. rate <= 0 - без ограничения.
+    """
+
+    # При таком количестве ключей удаляются ведра, которые успели заполниться
+    PRUNE_SIZE = 10000
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._buckets: Dict[Hashable, List[float]] = {}  # key -> [tokens, last_time]
+        self._prune_at = self.PRUNE_SIZE
+
+    def allow(self, key: Hashable, now: Optional[float] = None) -> bool:
+        """Списывает один токен, если он есть, и возвращает, разрешено ли событие"""
+        if self.rate <= 0:
+            return True
+
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self._prune_at:
+                self._prune(now)
+            self._buckets[key] = [self.burst - 1, now]
+            return True
+
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return True
+
+        bucket[0] = tokens
+        return False
+
+    def refund(self, key: Hashable):
+        """Возвращает токен, списанный allow() для события, которое все-таки не прошло"""
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            bucket[0] = min(self.burst, bucket[0] + 1)
+
+    def _prune(self, now: float):
+        """Удаляет ведра, которые заполнились бы полностью - они ничем не отличаются от новых"""
+        full_after = self.burst / self.rate
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if now - bucket[1] < full_after
+        }
+        # Если почти все ведра активны, следующая очистка - не раньше удвоения
+        self._prune_at = max(self.PRUNE_SIZE, 2 * len(self._buckets))
+
+
+class FloodControl:
+    """
+    Ограничение частоты событий от игрока в чате и от чата в целом.
+
+    Сначала проверяется ведро (chat_id, user_id), затем общее ведро чата,
+    поэтому один игрок не может израсходовать квоту всего чата. Если событие
+    отброшено по лимиту чата, токен игрока возвращается.
+    """
+
+    def __init__(self, user_rate: float, user_burst: float, chat_rate: float = 0, chat_burst: float = 0):
+        self.users = TokenBucketLimiter(user_rate, user_burst)
+        self.chats = TokenBucketLimiter(chat_rate, chat_burst)
+        self.allowed = 0
+        self.dropped_user = 0  # Отброшено по лимиту игрока
+        self.dropped_chat = 0  # Отброшено по лимиту чата
+
+    def allow(self, chat_id: int, user_id: int, now: Optional[float] = None) -> bool:
+        """Проверяет, можно ли обработать событие игрока"""
+        now = time.monotonic() if now is None else now
+        if not self.users.allow((chat_id, user_id), now):
+            self.dropped_user += 1
+            return False
+        if not self.chats.allow(chat_id, now):
+            self.users.refund((chat_id, user_id))
+            self.dropped_chat += 1
+            return False
+        self.allowed += 1
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает счетчики пропущенных и отброшенных событий"""
+        return {
+            'allowed': self.allowed,
+            'dropped_user': self.dropped_user,
+            'dropped_chat': self.dropped_chat,
+        }
@@ -0,0 +1,49 @@
+from collections import OrderedDict
+from typing import Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class VersionedCache(Generic[T]):
+    """
+    LRU-кэш значений, привязанных к версии данных.
+
+    Значение считается актуальным, пока версия данных совпадает с версией,
+    при которой оно было построено. Хранится не больше max_size ключей.
+    """
+
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self._items: 'OrderedDict[Hashable, Tuple[int, T]]' = OrderedDict()  # key -> (version, value)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: int) -> Optional[T]:
+        """Возвращает значение, если оно построено для этой версии"""
+        item = self._items.get(key)
+        if item is None or item[0] != version:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._items.move_to_end(key)
+        return item[1]
+
+    def put(self, key: Hashable, version: int, value: T):
+        """Сохраняет значение для версии, вытесняя самые старые ключи"""
+        self._items[key] = (version, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """Возвращает счетчики попаданий и промахов"""
+        return {
+            'size': len(self._items),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hit_ratio(),
+        }
@@ -0,0 +1,110 @@
+import os
+import gc
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE = 'default'
+PERFORMANCE_PROFILE = 'performance'
+
+
+def get_profile() -> str:
+    """Возвращает профиль из RUNTIME_PROFILE (default или performance)"""
+    profile = os.getenv('RUNTIME_PROFILE', DEFAULT_PROFILE).lower()
+    if profile not in (DEFAULT_PROFILE, PERFORMANCE_PROFILE):
+        logger.warning("Неизвестный профиль %s, используется %s", profile, DEFAULT_PROFILE)
+        return DEFAULT_PROFILE
+    return profile
+
+
+def get_settings() -> Dict:
+    """
+    Настройки профиля performance из переменных окружения.
+
+    Пул соединений Bot API рассчитан на одновременную обработку многих
+    обновлений, для getUpdates достаточно пары соединений с длинным таймаутом.
+
+    Параллельная обработка обновлений (concurrent_updates) по умолчанию
+    выключена: обработчики одного чата перестают выполняться строго
+    по порядку, поэтому она включается отдельно.
+    """
+    return {
+        'concurrent_updates': int(os.getenv('RUNTIME_CONCURRENT_UPDATES', '0')),
+        'pool_size': int(os.getenv('RUNTIME_POOL_SIZE', '256')),
+        'connect_timeout': float(os.getenv('RUNTIME_CONNECT_TIMEOUT', '5')),
+        'read_timeout': float(os.getenv('RUNTIME_READ_TIMEOUT', '10')),
+        'write_timeout': float(os.getenv('RUNTIME_WRITE_TIMEOUT', '10')),
+        'pool_timeout': float(os.getenv('RUNTIME_POOL_TIMEOUT', '3')),
+        'updates_pool_size': int(os.getenv('RUNTIME_UPDATES_POOL_SIZE', '2')),
+        'updates_read_timeout': float(os.getenv('RUNTIME_UPDATES_READ_TIMEOUT', '30')),
+        'gc_threshold': parse_gc_threshold(os.getenv('RUNTIME_GC_THRESHOLD', '50000,50,100')),
+    }
+
+
+def parse_gc_threshold(value: str) -> Tuple[int, ...]:
+    """Разбирает пороги сборщика мусора вида '50000,50,100'"""
+    return tuple(int(part) for part in value.split(','))
+
+
+def install_event_loop() -> str:
+    """Устанавливает uvloop, если он доступен, и возвращает имя цикла событий"""
+    try:
+        import uvloop
+    except ImportError:
+        return 'asyncio'
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return 'uvloop'
+
+
+def tune_gc(threshold: Tuple[int, ...]):
+    """
+    Поднимает порог поколения 0: обновления Telegram создают много
+    короткоживущих объектов, и сборка на каждые 700 выделений (по умолчанию)
+    срабатывает слишком часто.
+    """
+    gc.set_threshold(*threshold)
+
+
+def freeze_gc():
+    """
+    Переносит объекты, созданные при запуске (словарь слов, очки, индексы),
+    в постоянное поколение, чтобы сборщик мусора их больше не обходил.
+    """
+    gc.collect()
+    gc.freeze()
+
+
+def apply_runtime_profile(builder, profile: Optional[str] = None):
+    """Применяет профиль к ApplicationBuilder и процессу, возвращает builder"""
+    profile = profile or get_profile()
+    if profile != PERFORMANCE_PROFILE:
+        return builder
+
+    settings = get_settings()
+    loop_name = install_event_loop()
+    tune_gc(settings['gc_threshold'])
+
+    if settings['concurrent_updates'] > 0:
+        builder = builder.concurrent_updates(settings['concurrent_updates'])
+
+    builder = (
+        builder
+        .connection_pool_size(settings['pool_size'])
+        .connect_timeout(settings['connect_timeout'])
+        .read_timeout(settings['read_timeout'])
+        .write_timeout(settings['write_timeout'])
+        .pool_timeout(settings['pool_timeout'])
+        .get_updates_connection_pool_size(settings['updates_pool_size'])
+        .get_updates_connect_timeout(settings['connect_timeout'])
+        .get_updates_read_timeout(settings['updates_read_timeout'])
+        .get_updates_pool_timeout(settings['pool_timeout'])
+    )
+
+    logger.info(
+        "Профиль performance: цикл событий %s, обновлений параллельно %s, пул соединений %s, пороги GC %s",
+        loop_name, settings['concurrent_updates'] or 1, settings['pool_size'], settings['gc_threshold']
+    )
+    return builder
@@ -0,0 +1,21 @@
+import pytest
+
+from games import CrocodileGame
+
+
+def start_round(game: CrocodileGame, chat_id: int, host_id: int, word: str):
+    """Начинает раунд с заданным словом вместо случайного"""
+    game.start_game(chat_id)
+    game.set_host(chat_id, host_id)
+    state = game.active_games[chat_id]
+    state['current_word'] = word
+    state['word_lower'] = game._normalize_word(word)
+
+
+@pytest.fixture
+def game(tmp_path):
+    """Игра со статистикой во временной папке"""
+    return CrocodileGame(
+        scores_file=str(tmp_path / 'scores.json'),
+        packs_file=str(tmp_path / 'chat_packs.json')
+    )
@@ -0,0 +1,170 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+import admin_cache
+from admin_cache import ChatAdminCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(admin_cache, 'time', clock)
+    return clock
+
+
+def make_bot(*admin_ids):
+    bot = SimpleNamespace()
+    bot.get_chat_administrators = AsyncMock(
+        return_value=[SimpleNamespace(user=SimpleNamespace(id=user_id)) for user_id in admin_ids]
+    )
+    return bot
+
+
+def test_ttl_hit_makes_no_api_call(clock):
+    bot = make_bot(10)
+    cache = ChatAdminCache(ttl=60)
+
+    assert asyncio.run(cache.is_admin(bot, -1, 10))
+    clock.now += 59
+    assert asyncio.run(cache.is_admin(bot, -1, 10))
+    assert not asyncio.run(cache.is_admin(bot, -1, 20))
+
+    bot.get_chat_administrators.assert_awaited_once_with(-1)
+    assert cache.stats() == {'chats': 1, 'hits': 2, 'misses': 1}
+
+
+def test_expired_entry_is_refetched(clock):
+    bot = make_bot(10)
+    cache = ChatAdminCache(ttl=60)
+    asyncio.run(cache.is_admin(bot, -1, 10))
+
+    clock.now += 60
+    bot.get_chat_administrators.return_value = [SimpleNamespace(user=SimpleNamespace(id=20))]
+    assert not asyncio.run(cache.is_admin(bot, -1, 10))
+    assert asyncio.run(cache.is_admin(bot, -1, 20))
+    assert bot.get_chat_administrators.await_count == 2
+
+
+def test_expired_entry_falls_back_to_stale_list(clock):
+    bot = make_bot(10)
+    cache = ChatAdminCache(ttl=60)
+    asyncio.run(cache.is_admin(bot, -1, 10))
+
+    clock.now += 61
+    bot.get_chat_administrators.side_effect = RuntimeError('Telegram недоступен')
+    assert asyncio.run(cache.is_admin(bot, -1, 10))
+    assert not asyncio.run(cache.is_admin(bot, -2, 10))  # Устаревшего списка нет - прав нет
+
+
+def test_update_member_promote_and_demote(clock):
+    bot = make_bot(10)
+    cache = ChatAdminCache(ttl=60)
+    asyncio.run(cache.is_admin(bot, -1, 10))
+
+    cache.update_member(-1, 20, 'administrator')
+    assert asyncio.run(cache.is_admin(bot, -1, 20))
+    cache.update_member(-1, 10, 'member')
+    assert not asyncio.run(cache.is_admin(bot, -1, 10))
+    cache.update_member(-1, 30, 'creator')
+    assert asyncio.run(cache.is_admin(bot, -1, 30))
+
+    # Для чата, которого нет в кэше, события игнорируются
+    cache.update_member(-2, 20, 'administrator')
+    assert cache.stats()['chats'] == 1
+    bot.get_chat_administrators.assert_awaited_once()
+
+
+def test_invalidate_forces_fetch(clock):
+    bot = make_bot(10)
+    cache = ChatAdminCache(ttl=60)
+    asyncio.run(cache.is_admin(bot, -1, 10))
+
+    cache.invalidate(-1)
+    cache.invalidate(-2)
+    asyncio.run(cache.is_admin(bot, -1, 10))
+    assert bot.get_chat_administrators.await_count == 2
+
+
+def test_lru_eviction(clock):
+    bot = make_bot(10)
+    cache = ChatAdminCache(ttl=60, max_size=2)
+    asyncio.run(cache.is_admin(bot, -1, 10))
+    asyncio.run(cache.is_admin(bot, -2, 10))
+    asyncio.run(cache.is_admin(bot, -1, 10))  # -1 становится самым свежим
+    asyncio.run(cache.is_admin(bot, -3, 10))
+
+    assert list(cache._admins) == [-1, -3]
+    asyncio.run(cache.is_admin(bot, -2, 10))
+    assert bot.get_chat_administrators.await_count == 4
+
+
+def test_concurrent_checks_share_one_fetch(clock):
+    bot = make_bot(10)
+
+    async def slow_admins(chat_id):
+        await asyncio.sleep(0.01)
+        return [SimpleNamespace(user=SimpleNamespace(id=10))]
+
+    bot.get_chat_administrators.side_effect = slow_admins
+    cache = ChatAdminCache(ttl=60)
+
+    async def check():
+        return await asyncio.gather(*(cache.is_admin(bot, -1, user_id) for user_id in (10, 20, 10)))
+
+    assert asyncio.run(check()) == [True, False, True]
+    bot.get_chat_administrators.assert_awaited_once_with(-1)
+    assert cache._pending == {}
+
+
+def make_update(chat_type='supergroup', chat_id=-1, user_id=10, sender_chat_id=None):
+    chat = SimpleNamespace(id=chat_id, type=chat_type)
+    sender_chat = SimpleNamespace(id=sender_chat_id) if sender_chat_id is not None else None
+    return SimpleNamespace(
+        effective_chat=chat,
+        effective_user=SimpleNamespace(id=user_id),
+        message=SimpleNamespace(sender_chat=sender_chat, reply_text=AsyncMock())
+    )
+
+
+@pytest.fixture
+def bot_module(monkeypatch, clock):
+    bot = pytest.importorskip('bot')
+    monkeypatch.setattr(bot, 'admin_cache', ChatAdminCache(ttl=60))
+    return bot
+
+
+def test_anonymous_admin_of_the_chat(bot_module):
+    context = SimpleNamespace(bot=make_bot())
+    update = make_update(user_id=1087968824, sender_chat_id=-1)
+
+    assert asyncio.run(bot_module.is_chat_admin(update, context))
+    context.bot.get_chat_administrators.assert_not_awaited()
+
+
+def test_message_from_other_channel_is_checked(bot_module):
+    context = SimpleNamespace(bot=make_bot(10))
+    update = make_update(user_id=136817688, sender_chat_id=-100500)
+
+    assert not asyncio.run(bot_module.is_chat_admin(update, context))
+    context.bot.get_chat_administrators.assert_awaited_once_with(-1)
+
+
+def test_private_chat_and_require_admin(bot_module):
+    context = SimpleNamespace(bot=make_bot(10))
+    assert asyncio.run(bot_module.is_chat_admin(make_update(chat_type='private', chat_id=10), context))
+
+    update = make_update(user_id=20)
+    assert not asyncio.run(bot_module.require_admin(update, context))
+    update.message.reply_text.assert_awaited_once()
+    assert asyncio.run(bot_module.require_admin(make_update(user_id=10), context))
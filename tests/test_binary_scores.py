@@ -0,0 +1,33 @@
+from games.binary_scores import BinaryScoreFile, read_json_scores, write_binary_scores, write_json_scores
+from games.convert_scores import main as convert
+
+SCORES = {
+    -1001: {1: 10, 2: 3, 3: -1},
+    -5: {7: 2 ** 31 - 1},
+    42: {2 ** 40: 1},
+}
+
+
+def test_bin_json_round_trip(tmp_path):
+    json_path = str(tmp_path / 'scores.json')
+    bin_path = str(tmp_path / 'scores.bin')
+    back_path = str(tmp_path / 'back.json')
+    write_json_scores(json_path, SCORES)
+
+    assert convert(['to-bin', json_path, bin_path]) == 0
+    assert convert(['to-json', bin_path, back_path]) == 0
+    assert read_json_scores(back_path) == SCORES
+
+
+def test_load_chat_and_load_all(tmp_path):
+    path = str(tmp_path / 'scores.bin')
+    write_binary_scores(path, {**SCORES, 7: {}})
+
+    with BinaryScoreFile(path) as score_file:
+        # Пустые чаты не записываются
+        assert len(score_file) == len(SCORES)
+        assert score_file.load_all() == SCORES
+        for chat_id, users in SCORES.items():
+            assert score_file.load_chat(chat_id) == users
+        assert score_file.load_chat(7) == {}
+        assert score_file.load_chat(0) == {}
@@ -0,0 +1,69 @@
+from tests.conftest import start_round
+
+HOST = 1
+
+
+def test_first_correct_guess_by_message_id_wins(game):
+    start_round(game, -1, HOST, 'Крокодил')
+    # Пачка пришла не по порядку сообщений
+    winner = game.check_guesses(-1, [
+        (30, 'крокодил', 103),
+        (20, 'Крокодил', 101),
+        (40, 'жираф', 100),
+    ])
+
+    assert winner == (20, 101)
+    assert game.is_guessed(-1)
+    assert game.get_guesser(-1) == 20
+
+
+def test_host_guess_is_skipped(game):
+    start_round(game, -1, HOST, 'Крокодил')
+    winner = game.check_guesses(-1, [(HOST, 'крокодил', 1), (20, 'крокодил', 2)])
+
+    assert winner == (20, 2)
+    assert game.get_score(-1, HOST) == 0
+
+
+def test_only_host_guessing_leaves_round_open(game):
+    start_round(game, -1, HOST, 'Крокодил')
+
+    assert game.check_guesses(-1, [(HOST, 'крокодил', 1)]) is None
+    assert not game.is_guessed(-1)
+
+
+def test_guessed_round_returns_none(game):
+    start_round(game, -1, HOST, 'Крокодил')
+    game.check_guesses(-1, [(20, 'крокодил', 1)])
+
+    assert game.check_guesses(-1, [(30, 'крокодил', 2)]) is None
+    assert game.get_score(-1, 30) == 0
+
+
+def test_no_active_game_returns_none(game):
+    assert game.check_guesses(-1, [(20, 'крокодил', 1)]) is None
+
+
+def test_exactly_one_point_awarded(game):
+    start_round(game, -1, HOST, 'Крокодил')
+    game.check_guesses(-1, [(20, 'крокодил', 1), (20, 'крокодил', 2), (30, 'крокодил', 3)])
+
+    assert game.get_all_scores(-1) == {20: 1}
+
+
+def test_length_shortcut_keeps_punctuated_and_cased_guesses(game):
+    start_round(game, -1, HOST, 'Смарт-часы')
+    # Нормализованное слово 'смартчасы' (9 символов); короткие сообщения
+    # пропускаются без нормализации, но отгадка с лишними знаками подходит
+    winner = game.check_guesses(-1, [
+        (20, 'часы', 1),
+        (30, '  СМАРТ-ЧАСЫ!!!  ', 2),
+    ])
+
+    assert winner == (30, 2)
+
+
+def test_shortcut_with_exact_length_guess(game):
+    start_round(game, -1, HOST, 'Кот')
+
+    assert game.check_guesses(-1, [(20, 'ко', 1), (30, 'КОТ', 2)]) == (30, 2)
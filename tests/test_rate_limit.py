@@ -0,0 +1,94 @@
+from rate_limit import FloodControl, TokenBucketLimiter
+
+
+def test_burst_then_refill():
+    limiter = TokenBucketLimiter(rate=2, burst=3)
+
+    assert [limiter.allow('a', now=0) for _ in range(4)] == [True, True, True, False]
+    # За 0.5 с набирается один токен
+    assert limiter.allow('a', now=0.5)
+    assert not limiter.allow('a', now=0.5)
+    # Ведро не переполняется больше burst
+    assert [limiter.allow('a', now=100) for _ in range(4)] == [True, True, True, False]
+
+
+def test_keys_are_independent():
+    limiter = TokenBucketLimiter(rate=1, burst=1)
+
+    assert limiter.allow('a', now=0)
+    assert not limiter.allow('a', now=0)
+    assert limiter.allow('b', now=0)
+
+
+def test_zero_rate_disables_limit():
+    limiter = TokenBucketLimiter(rate=0, burst=0)
+
+    assert all(limiter.allow('a', now=0) for _ in range(100))
+
+
+def test_refund():
+    limiter = TokenBucketLimiter(rate=1, burst=2)
+    limiter.allow('a', now=0)
+    limiter.allow('a', now=0)
+    assert not limiter.allow('a', now=0)
+
+    limiter.refund('a')
+    assert limiter.allow('a', now=0)
+    limiter.refund('missing')  # Неизвестный ключ игнорируется
+
+
+def test_prune_drops_full_buckets(monkeypatch):
+    monkeypatch.setattr(TokenBucketLimiter, 'PRUNE_SIZE', 4)
+    limiter = TokenBucketLimiter(rate=1, burst=2)  # Ведро заполняется за 2 с
+    for key in range(3):
+        limiter.allow(key, now=0)
+    limiter.allow(3, now=1.5)
+
+    # Пятый ключ запускает очистку: ведра 0-2 уже заполнились бы, ведро 3 - нет
+    limiter.allow(4, now=2.5)
+    assert set(limiter._buckets) == {3, 4}
+    assert limiter._prune_at == 4
+
+
+def test_prune_threshold_doubles_when_buckets_are_active(monkeypatch):
+    monkeypatch.setattr(TokenBucketLimiter, 'PRUNE_SIZE', 4)
+    limiter = TokenBucketLimiter(rate=1, burst=2)
+    for key in range(5):
+        limiter.allow(key, now=0)
+
+    # Все ведра активны: очистка ничего не удалила, следующая - при 8 ключах
+    assert len(limiter._buckets) == 5
+    assert limiter._prune_at == 8
+    for key in range(5, 8):
+        limiter.allow(key, now=0)
+    assert limiter._prune_at == 8
+    limiter.allow(8, now=0)
+    assert limiter._prune_at == 16
+    assert len(limiter._buckets) == 9
+
+
+def test_flood_control_counters():
+    flood = FloodControl(user_rate=1, user_burst=2, chat_rate=1, chat_burst=3)
+
+    assert flood.allow(-1, 10, now=0)
+    assert flood.allow(-1, 10, now=0)
+    assert not flood.allow(-1, 10, now=0)  # Лимит игрока
+    assert flood.allow(-1, 20, now=0)
+    assert not flood.allow(-1, 30, now=0)  # Лимит чата
+
+    assert flood.stats() == {'allowed': 3, 'dropped_user': 1, 'dropped_chat': 1}
+
+
+def test_chat_cap_does_not_drain_user_quota():
+    flood = FloodControl(user_rate=1, user_burst=2, chat_rate=1, chat_burst=2)
+    flood.allow(-1, 10, now=0)
+    flood.allow(-1, 20, now=0)
+
+    # Чат исчерпан: сообщения игрока 30 отбрасываются, но его токены не тратятся
+    for _ in range(5):
+        assert not flood.allow(-1, 30, now=0)
+    assert flood.dropped_chat == 5
+
+    # Через 1 с в чате появляется один токен, у игрока 30 ведро по-прежнему полное
+    assert flood.allow(-1, 30, now=1)
+    assert flood.users._buckets[(-1, 30)][0] == 1
@@ -0,0 +1,55 @@
+from render_cache import VersionedCache
+
+
+def test_same_version_hits():
+    cache = VersionedCache(max_size=10)
+    cache.put(-1, 3, 'таблица')
+
+    assert cache.get(-1, 3) == 'таблица'
+    assert cache.get(-1, 4) is None
+    assert cache.get(-2, 3) is None
+
+
+def test_score_changes_invalidate(game):
+    cache = VersionedCache(max_size=10)
+    cache.put(-1, game.get_score_version(-1), 'пусто')
+
+    game.add_score(-1, 10)
+    assert cache.get(-1, game.get_score_version(-1)) is None
+
+    cache.put(-1, game.get_score_version(-1), '10: 1')
+    assert cache.get(-1, game.get_score_version(-1)) == '10: 1'
+
+    game.reset_scores(-1)
+    assert cache.get(-1, game.get_score_version(-1)) is None
+
+    # Изменения в другом чате версию не трогают
+    cache.put(-1, game.get_score_version(-1), 'пусто')
+    game.add_score(-2, 10)
+    assert cache.get(-1, game.get_score_version(-1)) == 'пусто'
+
+
+def test_lru_eviction():
+    cache = VersionedCache(max_size=2)
+    cache.put(1, 0, 'a')
+    cache.put(2, 0, 'b')
+    cache.get(1, 0)  # 1 становится самым свежим
+    cache.put(3, 0, 'c')
+
+    assert cache.get(2, 0) is None
+    assert cache.get(1, 0) == 'a'
+    assert cache.get(3, 0) == 'c'
+    assert cache.stats()['size'] == 2
+
+
+def test_hit_ratio():
+    cache = VersionedCache(max_size=10)
+    assert cache.hit_ratio() == 0.0
+
+    cache.put(1, 0, 'a')
+    cache.get(1, 0)
+    cache.get(1, 0)
+    cache.get(1, 1)
+    cache.get(2, 0)
+
+    assert cache.stats() == {'size': 1, 'hits': 2, 'misses': 2, 'hit_ratio': 0.5}
@@ -0,0 +1,77 @@
+from games.scores import ResidentScores, SqliteScoreStore
+
+
+def make_resident(tmp_path, **kwargs):
+    return ResidentScores(SqliteScoreStore(str(tmp_path / 'scores.db')), **kwargs)
+
+
+def test_eviction_keeps_budget_and_least_recent_chats_leave(tmp_path):
+    resident = make_resident(tmp_path, max_chats=2)
+    resident.add(1, 10, 1)
+    resident.add(2, 20, 1)
+    resident.get(1)  # чат 1 становится самым свежим
+    resident.add(3, 30, 1)
+
+    assert list(resident.chats) == [1, 3]
+    assert resident.evictions == 1
+    assert resident.entries == 2
+
+
+def test_entries_budget(tmp_path):
+    resident = make_resident(tmp_path, max_entries=3)
+    resident.add(1, 10, 1)
+    resident.add(1, 11, 1)
+    resident.add(2, 20, 1)
+    resident.add(2, 21, 1)
+
+    assert list(resident.chats) == [2]
+    assert resident.entries == 2
+
+
+def test_write_back_without_autosave(tmp_path):
+    resident = make_resident(tmp_path, max_chats=1, autosave=False)
+    store = resident.store
+    resident.add(1, 10, 5)
+
+    # Без autosave изменения в хранилище не пишутся сразу
+    assert store.load_chat(1) == {}
+    assert resident.dirty == {1}
+
+    # При вытеснении грязный чат сохраняется
+    resident.add(2, 20, 3)
+    assert store.load_chat(1) == {10: 5}
+    assert store.load_chat(2) == {}
+
+    # Вытесненный чат загружается обратно с теми же очками
+    assert resident.add(1, 10, 1) == 6
+
+    resident.flush()
+    assert store.load_chat(1) == {10: 6}
+    assert store.load_chat(2) == {20: 3}
+    assert not resident.dirty
+
+
+def test_delete_removes_from_memory_and_store(tmp_path):
+    resident = make_resident(tmp_path, autosave=False)
+    resident.add(1, 10, 5)
+    resident.flush()
+    resident.delete(1)
+
+    assert resident.get(1) == {}
+    assert resident.store.load_chat(1) == {}
+    assert resident.entries == 0
+
+
+def test_empty_chat_is_not_resident(tmp_path):
+    resident = make_resident(tmp_path, max_chats=1)
+    resident.add(1, 10, 5)
+
+    # Чтение пустого чата не вытесняет чат с очками
+    assert resident.get(2) == {}
+    assert list(resident.chats) == [1]
+    assert resident.evictions == 0
+
+    # Первое очко добавляет чат в набор
+    assert resident.add(2, 20, 1) == 1
+    assert list(resident.chats) == [2]
+    assert resident.entries == 1
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from games import CrocodileGame
+
+
+@pytest.fixture
+def make_game(tmp_path):
+    """Создает игру с общими файлами статистики; resident=True включает scores.db"""
+    games = []
+
+    def make(resident: bool, scores_file: str = 'scores.json') -> CrocodileGame:
+        game = CrocodileGame(
+            scores_file=str(tmp_path / scores_file),
+            scores_db=str(tmp_path / 'scores.db'),
+            packs_file=str(tmp_path / 'chat_packs.json'),
+            max_resident_chats=10 if resident else 0
+        )
+        games.append(game)
+        return game
+
+    yield make
+    for game in games:
+        if game.resident is not None:
+            game.resident.store.close()
+
+
+def write_json(tmp_path, scores):
+    (tmp_path / 'scores.json').write_text(json.dumps(scores), encoding='utf-8')
+
+
+def test_resident_points_survive_switching_budget_off(tmp_path, make_game):
+    write_json(tmp_path, {'1': {'10': 5}})
+    make_game(resident=True).add_score(1, 10)
+
+    assert make_game(resident=False).get_all_scores(1) == {10: 6}
+    # Экспорт записан в scores.json
+    assert json.loads((tmp_path / 'scores.json').read_text(encoding='utf-8')) == {'1': {'10': 6}}
+
+
+def test_json_points_survive_switching_budget_on(tmp_path, make_game):
+    write_json(tmp_path, {'1': {'10': 5}})
+    make_game(resident=True)
+    make_game(resident=False).add_score(1, 20)
+
+    assert make_game(resident=True).get_all_scores(1) == {10: 5, 20: 1}
+
+
+def test_reset_in_either_mode_is_kept(tmp_path, make_game):
+    write_json(tmp_path, {'1': {'10': 5}, '2': {'20': 1}})
+    make_game(resident=True).reset_scores(1)
+    assert make_game(resident=True).get_all_scores(1) == {}
+
+    game = make_game(resident=False)
+    assert game.get_all_scores(1) == {}
+    game.reset_scores(2)
+    assert make_game(resident=True).get_all_scores(2) == {}
+
+
+def test_resident_mode_without_scores_file(tmp_path, make_game):
+    make_game(resident=True).add_score(1, 10, 3)
+
+    assert make_game(resident=False).get_all_scores(1) == {10: 3}
+
+
+def test_binary_scores_file(tmp_path, make_game):
+    make_game(resident=False, scores_file='scores.bin').add_score(1, 10, 2)
+    make_game(resident=True, scores_file='scores.bin').add_score(1, 10)
+
+    assert make_game(resident=False, scores_file='scores.bin').get_all_scores(1) == {10: 3}
@@ -0,0 +1,77 @@
+import random
+
+from games.word_chain import WordChainGame, WordIndex, last_letter, normalize_word
+from games.words import WORDS
+
+SAMPLE = ['кот', 'кит', 'киты', 'крокодил', 'слон', 'слоненок', 'ночь', 'нос', 'ёжик', 'Смарт-часы']
+
+
+def test_index_membership_matches_set():
+    words = {normalize_word(word) for word in WORDS}
+    index = WordIndex(WORDS)
+
+    assert index.size == len(words)
+    for word in words:
+        assert word in index
+
+    # Префиксы, продолжения и случайные строки из тех же букв
+    rnd = random.Random(1)
+    letters = sorted({char for word in words for char in word})
+    probes = set()
+    for word in rnd.sample(sorted(words), 500):
+        probes.update((word[:-1], word + 'а', word[1:]))
+    probes.update(''.join(rnd.choices(letters, k=rnd.randint(1, 8))) for _ in range(2000))
+    for probe in probes:
+        assert (probe in index) == (probe in words), probe
+
+
+def test_index_prefix_and_counts():
+    index = WordIndex(SAMPLE)
+    words = sorted(normalize_word(word) for word in SAMPLE)
+
+    assert list(index.iter_prefix('')) == words
+    assert list(index.iter_prefix('сл')) == ['слон', 'слоненок']
+    assert list(index.iter_prefix('я')) == []
+    for letter in set(word[0] for word in words):
+        assert index.count_starting_with(letter) == sum(word[0] == letter for word in words)
+    assert 'ежик' in index
+    assert 'смартчасы' in index
+    # Общие окончания хранятся один раз
+    assert index.node_count < sum(map(len, words)) + 1
+
+
+def test_last_letter_skips_soft_sign():
+    assert last_letter('ночь') == 'ч'
+    assert last_letter('киты') == 'т'
+    assert last_letter('слон') == 'н'
+
+
+def test_moves():
+    game = WordChainGame(SAMPLE)
+    assert game.start_game(1)
+    assert not game.start_game(1)
+
+    assert game.play_word(1, 10, 'Кот!') == (WordChainGame.OK, 'т')
+    assert game.play_word(1, 20, 'слон') == (WordChainGame.WRONG_LETTER, 'т')
+    assert game.play_word(1, 20, 'привет') == (WordChainGame.NOT_A_WORD, 'т')
+    assert game.get_moves(1) == 1
+
+    game.active_games[1]['last_letter'] = 'к'
+    assert game.play_word(1, 10, 'кит') == (WordChainGame.SAME_PLAYER, 'к')
+    assert game.play_word(1, 20, 'кот') == (WordChainGame.ALREADY_USED, 'к')
+    assert game.remaining(1, 'к') == 3
+    assert game.hint(1) == 'кит'
+
+
+def test_idle_game_times_out():
+    game = WordChainGame(SAMPLE)
+    game.start_game(1)
+    assert not game.check_timeout(1)
+
+    game.active_games[1]['last_move_time'] -= game.active_games[1]['timeout_seconds']
+    assert game.check_timeout(1)
+
+    # Принятый ход перезапускает таймер
+    game.play_word(1, 10, 'кот')
+    assert not game.check_timeout(1)
+    assert not game.check_timeout(2)
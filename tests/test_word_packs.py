@@ -0,0 +1,66 @@
+import pytest
+
+from games.build_word_packs import build
+from games.word_packs import FORMAT_VERSION, HEADER, MAGIC, MappedWordPack, load_word_packs, read_word_source, write_word_pack
+
+
+def test_build_and_index_lookup(tmp_path):
+    source = tmp_path / 'ru.txt'
+    source.write_text('# title: Русский\nкот\n\n# комментарий\nёжик\nкот\nкрокодил гена\n', encoding='utf-8')
+
+    title, words = read_word_source(str(source))
+    assert title == 'Русский'
+    assert words == ['кот', 'ёжик', 'крокодил гена']
+
+    pack = MappedWordPack(build(str(source)))
+    try:
+        assert pack.title == 'Русский'
+        assert len(pack) == len(words)
+        assert [pack[i] for i in range(len(pack))] == words
+        assert pack[-1] == words[-1]
+        with pytest.raises(IndexError):
+            pack[len(words)]
+    finally:
+        pack.close()
+
+
+def test_empty_pack(tmp_path):
+    path = str(tmp_path / 'empty.pack')
+    write_word_pack(path, [])
+    pack = MappedWordPack(path)
+    assert len(pack) == 0
+    pack.close()
+
+
+def test_broken_pack_is_skipped(tmp_path):
+    write_word_pack(str(tmp_path / 'good.pack'), ['слово'], title='Хороший')
+    (tmp_path / 'junk.pack').write_bytes(b'not a pack at all')
+    (tmp_path / 'zero.pack').write_bytes(b'')
+    data = (tmp_path / 'good.pack').read_bytes()
+    (tmp_path / 'truncated.pack').write_bytes(data[:-2])
+
+    packs = load_word_packs(str(tmp_path))
+    try:
+        assert list(packs) == ['good']
+        assert packs['good'][0] == 'слово'
+    finally:
+        for pack in packs.values():
+            pack.close()
+
+
+def test_bad_title_closes_mmap(tmp_path, monkeypatch):
+    path = tmp_path / 'title.pack'
+    path.write_bytes(HEADER.pack(MAGIC, FORMAT_VERSION, 2, 0) + b'\xff\xfe' + b'\0' * 4)
+
+    closed = []
+    original_close = MappedWordPack.close
+
+    def close(self):
+        closed.append(self.path)
+        original_close(self)
+
+    monkeypatch.setattr(MappedWordPack, 'close', close)
+    with pytest.raises(ValueError):
+        MappedWordPack(str(path))
+    assert closed == [str(path)]
+    assert load_word_packs(str(tmp_path)) == {}